@@ -0,0 +1,60 @@
+import numpy as np
+import scipy.sparse as sp
+
+class AssemblyPlan:
+    def __init__(self, dof_maps, num_dof):
+        """
+        Symbolic assembly: the CSR sparsity pattern of the global matrix and, for every
+        entry of every element block, the index of its nonzero slot (-1 when it touches
+        a constrained DOF). It depends only on connectivity, constraints and DOF
+        numbering, so it is shared by K and M and reused by every numeric assembly.
+        """
+        self.dof_maps = np.array(dof_maps, dtype=np.int64)
+        self.num_dof = num_dof
+        n_elem, n_local = self.dof_maps.shape
+
+        rows = np.repeat(self.dof_maps, n_local, axis=1)
+        cols = np.tile(self.dof_maps, (1, n_local))
+        valid = (rows != -1) & (cols != -1)
+
+        # Unique (row, col) pairs in row-major order give the CSR pattern
+        keys, inverse = np.unique(rows[valid] * num_dof + cols[valid], return_inverse=True)
+        self.indices = (keys % num_dof).astype(np.int32)
+        self.indptr = np.zeros(num_dof + 1, dtype=np.int32)
+        np.cumsum(np.bincount(keys // num_dof, minlength=num_dof), out=self.indptr[1:])
+        self.nnz = len(keys)
+
+        # Scatter index from every block entry (n_elem, n_local * n_local) to its slot
+        self.scatter = np.full((n_elem, n_local * n_local), -1, dtype=np.int64)
+        self.scatter[valid] = inverse.ravel()
+        self._valid = valid
+
+    def assemble(self, blocks):
+        """
+        Numeric assembly: sum the element value stack into the pattern with one bincount.
+        """
+        values = np.asarray(blocks, dtype=float).reshape(len(self.scatter), -1)
+        data = np.bincount(self.scatter[self._valid], weights=values[self._valid], minlength=self.nnz)
+        return sp.csr_matrix((data, self.indices, self.indptr), shape=(self.num_dof, self.num_dof))
+
+class ElementMatrixCache:
+    def __init__(self, plan, blocks):
+        """
+        Global sparse matrix kept together with the element blocks it was assembled from,
+        so changed elements can be patched in place instead of reassembling everything.
+        """
+        self.plan = plan
+        self.blocks = np.array(blocks, dtype=float)
+        self.matrix = plan.assemble(self.blocks)
+
+    def update(self, elements, new_blocks):
+        """
+        Replace the blocks of `elements`: the old blocks are subtracted from and the new
+        ones added to the CSR values in place. The cost scales with the number of
+        changed elements, the sparsity pattern is unchanged.
+        """
+        delta = (new_blocks - self.blocks[elements]).reshape(len(elements), -1)
+        slots = self.plan.scatter[elements]
+        valid = slots != -1
+        np.add.at(self.matrix.data, slots[valid], delta[valid])
+        self.blocks[elements] = new_blocks
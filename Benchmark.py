@@ -0,0 +1,159 @@
+import argparse
+import json
+import platform
+import time
+import warnings
+import numpy as np
+import scipy
+import Generators
+from Dynamic import dynamic
+
+def _warren(num_dof):
+    # Bays of 1 m
+    n_bays = Generators.warren_panels_for_dofs(num_dof)
+    return Generators.warren_bridge(float(n_bays), n_bays)
+
+MODELS = {
+    "warren": _warren,
+    "lattice": lambda num_dof: Generators.space_lattice(Generators.lattice_size_for_dofs(num_dof)),
+}
+
+# Solve options per backend and the largest model each one is run on.
+# CG is capped so slender, badly conditioned models cannot run away; the record
+# tells whether it converged.
+CG_MAXITER = 5000
+BACKENDS = {
+    "dense": ({"sparse": False}, 2000),
+    "direct": ({"method": "direct"}, 200000),
+    "cg-jacobi": ({"method": "cg", "preconditioner": "jacobi", "maxiter": CG_MAXITER}, 1000000),
+    "cg-ssor": ({"method": "cg", "preconditioner": "ssor", "maxiter": CG_MAXITER}, 1000000),
+    "cg-matrix-free": ({"method": "cg", "preconditioner": "jacobi", "matrix_free": True,
+                        "maxiter": CG_MAXITER}, 1000000),
+}
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+
+def _environment():
+    return {
+        "python": platform.python_version(), "numpy": np.__version__, "scipy": scipy.__version__,
+        "machine": platform.machine(), "processor": platform.processor(),
+    }
+
+def run_case(model, target_dof, backend, repeat=3, dynamic_steps=20, dynamic_max_dof=2000):
+    """
+    Build the model fresh for every repetition and run the full pipeline once:
+    enumerate, assemble, solve and internal-force recovery, plus a short fixed-step
+    generalized-alpha run on small models. Returns the best time of every phase.
+    """
+    options, _ = BACKENDS[backend]
+    best = {}
+    steps = None
+    for _ in range(repeat):
+        structure = MODELS[model](target_dof)
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            structure.solve(**options)
+        structure.compute_internal_forces()
+        phases = {name: entry["seconds"] for name, entry in structure.timing_report().items()}
+        phases["total"] = time.perf_counter() - start
+
+        if dynamic_steps and structure.num_dof <= dynamic_max_dof:
+            start = time.perf_counter()
+            solver = dynamic(structure)
+            solver.generalized_alpha(1e-4, 0.0, dynamic_steps * 1e-4)
+            phases["dynamic"] = time.perf_counter() - start
+            # The step size adapts, the step count tells if the work changed
+            steps = len(solver.time) - 1
+
+        for name, seconds in phases.items():
+            best[name] = min(best.get(name, np.inf), seconds)
+
+    return {
+        "model": model, "target_dof": int(target_dof), "backend": backend,
+        "num_dof": int(structure.num_dof), "num_elements": len(structure.elements),
+        "nnz": int(structure.operators.K.nnz), "dynamic_steps": steps, "seconds": best,
+        "iterations": structure.iterative.iterations[0] if options.get("method") == "cg" else None,
+        "converged": bool(structure.iterative.converged[0]) if options.get("method") == "cg" else True,
+    }
+
+def run(models=tuple(MODELS), sizes=DEFAULT_SIZES, backends=tuple(BACKENDS), repeat=3, dynamic_steps=20):
+    """
+    Run every model, size and backend combination within the backend size limits.
+    """
+    records = []
+    for model in models:
+        for target_dof in sizes:
+            for backend in backends:
+                if target_dof > BACKENDS[backend][1]:
+                    continue
+                record = run_case(model, target_dof, backend, repeat, dynamic_steps)
+                print(f"{model:8s} {record['num_dof']:>8d} DOF {backend:15s} {record['seconds']['total']:.4f} s")
+                records.append(record)
+    return {"environment": _environment(), "repeat": repeat, "results": records}
+
+def save(results, path):
+    """
+    Write results as sorted, indented JSON so two runs diff line by line.
+    """
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+def compare(baseline, current, threshold=1.25, min_seconds=1e-3):
+    """
+    Compare two benchmark runs phase by phase. A phase is flagged as a regression
+    when it is `threshold` times slower and above `min_seconds`, to skip timer noise.
+    Returns the list of (model, target_dof, backend, phase, old, new) regressions.
+    """
+    key = lambda record: (record["model"], record["target_dof"], record["backend"])
+    old_records = {key(record): record for record in baseline["results"]}
+    regressions = []
+    for record in current["results"]:
+        old = old_records.get(key(record))
+        if old is None:
+            continue
+        for phase, seconds in sorted(record["seconds"].items()):
+            old_seconds = old["seconds"].get(phase)
+            if old_seconds is None:
+                continue
+            ratio = seconds / old_seconds if old_seconds > 0 else (np.inf if seconds > 0 else 1.0)
+            flag = ratio > threshold and seconds > min_seconds
+            if flag:
+                regressions.append(key(record) + (phase, old_seconds, seconds))
+            print(f"{record['model']:8s} {record['num_dof']:>8d} {record['backend']:15s} {phase:16s} "
+                  f"{old_seconds:10.4f} -> {seconds:10.4f} s  x{ratio:5.2f}{'  REGRESSION' if flag else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark on generated trusses.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmark and save the results")
+    run_parser.add_argument("output")
+    run_parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+    run_parser.add_argument("--sizes", nargs="+", type=float, default=list(DEFAULT_SIZES),
+                            help="target DOF counts, up to 1e6")
+    run_parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--dynamic-steps", type=int, default=20)
+
+    compare_parser = commands.add_parser("compare", help="diff two saved runs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=1.25)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        results = run(args.models, [int(size) for size in args.sizes], args.backends, args.repeat, args.dynamic_steps)
+        save(results, args.output)
+    else:
+        regressions = compare(load(args.baseline), load(args.current), args.threshold)
+        print(f"{len(regressions)} regressions")
+        raise SystemExit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
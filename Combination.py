@@ -0,0 +1,106 @@
+import numpy as np
+
+class Envelope:
+    def __init__(self, maximum, minimum, max_combination, min_combination, names):
+        """
+        Max/min response per entry (element or DOF) and the index of the
+        governing combination for each.
+        """
+        self.maximum = maximum
+        self.minimum = minimum
+        self.max_combination = max_combination
+        self.min_combination = min_combination
+        self.names = names
+
+    def __str__(self):
+        return f"Envelope over {len(self.maximum)} entries."
+
+    def governing(self, index):
+        """
+        Get (max, max combination name, min, min combination name) of one entry.
+        """
+        return (self.maximum[index], self.names[self.max_combination[index]],
+                self.minimum[index], self.names[self.min_combination[index]])
+
+class LoadCombination:
+    def __init__(self, results, factors, names=None, chunk_size=4096):
+        """
+        Superpose solved basic load cases with a table of combination factors.
+        `results` is a LoadCaseResults and `factors` an (n_combinations, n_cases) array.
+        The truss analysis is linear, so a combination is just the weighted sum of the
+        basic cases and nothing is re-solved.
+        """
+        self.results = results
+        self.factors = np.atleast_2d(np.asarray(factors, dtype=float))
+        if self.factors.shape[1] != results.num_cases:
+            raise ValueError(f"Factor table has {self.factors.shape[1]} columns, expected {results.num_cases} load cases.")
+        self.num_combinations = self.factors.shape[0]
+        if names is None:
+            names = [f"CO{i + 1}" for i in range(self.num_combinations)]
+        if len(names) != self.num_combinations:
+            raise ValueError(f"Expected {self.num_combinations} combination names, got {len(names)}.")
+        self.names = list(names)
+        # Number of combinations evaluated per matrix product, bounds the temporary memory
+        self.chunk_size = chunk_size
+
+    def __str__(self):
+        return f"LoadCombination with {self.num_combinations} combinations of {self.results.num_cases} load cases."
+
+    def displacements(self, combination):
+        """
+        Get the (num_dof,) displacements of one combination.
+        """
+        return self.results.displacements @ self.factors[self._index(combination)]
+
+    def axial_forces(self, combination):
+        """
+        Get the (n_elem,) axial forces of one combination, tension positive
+        like Element.compute_internal_force.
+        """
+        return self.results.axial_forces @ self.factors[self._index(combination)]
+
+    def axial_force_envelope(self):
+        """
+        Max/min axial force per member over all combinations with the governing combination.
+        """
+        return self._envelope(self.results.axial_forces)
+
+    def displacement_envelope(self):
+        """
+        Max/min displacement per free DOF over all combinations with the governing combination.
+        """
+        return self._envelope(self.results.displacements)
+
+    def _index(self, combination):
+        if isinstance(combination, str):
+            return self.names.index(combination)
+        return combination
+
+    def _envelope(self, basic):
+        """
+        Evaluate all combinations as (entries x cases) @ (cases x combinations)
+        products, one chunk of combinations at a time, keeping running extremes.
+        """
+        n = basic.shape[0]
+        maximum = np.full(n, -np.inf)
+        minimum = np.full(n, np.inf)
+        max_combination = np.zeros(n, dtype=np.int64)
+        min_combination = np.zeros(n, dtype=np.int64)
+        rows = np.arange(n)
+
+        for start in range(0, self.num_combinations, self.chunk_size):
+            combined = basic @ self.factors[start:start + self.chunk_size].T
+
+            chunk_max = combined.argmax(axis=1)
+            values = combined[rows, chunk_max]
+            better = values > maximum
+            maximum[better] = values[better]
+            max_combination[better] = start + chunk_max[better]
+
+            chunk_min = combined.argmin(axis=1)
+            values = combined[rows, chunk_min]
+            better = values < minimum
+            minimum[better] = values[better]
+            min_combination[better] = start + chunk_min[better]
+
+        return Envelope(maximum, minimum, max_combination, min_combination, self.names)
@@ -1,32 +1,83 @@
 
 import numpy as np
+import scipy.linalg as la
+import scipy.sparse as sp
 import matplotlib.pyplot as plt
+from Instrumentation import count_kernel, logger, profile_phase, record_matrix
+from History import MemoryHistory, ProbeHistory, StreamingHistory
+from Solver import DirectSolver, FactorCache, IterativeSolver
 
 class dynamic:
-    def __init__(self, structure):
+    def __init__(self, structure, sparse=True, factor_cache_size=4):
         """
-        Dynamic solver setup.
+        Dynamic solver setup. With `sparse` (default) M, K and C stay sparse CSR
+        matrices and Keff is factorized by sparse LU, otherwise dense arrays and a
+        dense LU are used. The effective stiffness is factorized once per distinct
+        time step and kept in an LRU cache of `factor_cache_size` entries.
+        The operators are refreshed when the model changes between runs.
         """
         self.structure = structure
 
-        # 1. Enumerate DOFs first so all assembly uses the same global numbering
-        self.structure.enumerate_dof()   # ensures node.dof_number[] is set
+        # 1. Memoized operators, DOFs are enumerated once on first access
+        self.operators = self.structure.operators
+        self.sparse = sparse
+        self._update_operators()
 
-        # 2. Assemble matrices with this DOF map
-        self.M = self.structure.assemble_mass_matrix()
-        self.K = self.structure.assemble_stiffness_matrix()
-        self.R = self.structure.assemble_load_vector()
+        # 2. Keff factors keyed by (model state, dt, rho, alpha_1, alpha_2)
+        self.factors = FactorCache(factor_cache_size)
 
-        # 3. Store DOF mapping info, not just a count
+    def _model_state(self):
+        """
+        Snapshot of everything M and K depend on: geometry, constraints,
+        connectivity, element properties and DOF ordering.
+        """
+        return self.structure._stiffness_state() + self.structure.element_table.state("density")
+
+    def _update_operators(self):
+        """
+        Take M, K, R, the DOF numbering and the initial conditions from the model.
+        """
+        operators = self.operators
+
+        # Sparse operators, or dense copies for small models
+        self.M = operators.M if self.sparse else operators.M.toarray()
+        self.K = operators.K if self.sparse else operators.K.toarray()
+        self.R = operators.f
+
+        # Store DOF mapping info, not just a count
         self.num_dof = self.structure.num_dof  # integer count
-        self.dof_map = [node.dof_number for node in self.structure.nodes]
+        self.dof_map = self.structure.dof_map.copy()
 
-        # 4. Initial conditions
+        # Initial conditions
         self.initial_displacement = self.structure.initial_displacement()
         self.initial_velocity = self.structure.initial_velocity()
+        self._state = self._model_state()
 
+    @profile_phase("generalized_alpha")
     def generalized_alpha(self, initial_step, initial_time, final_time,
-                          alpha_1=0.01, alpha_2=0.02, rho=0.9):
+                          alpha_1=0.01, alpha_2=0.02, rho=0.9, v1=0.5, v2=1.0, ne=1e-2,
+                          output=None, chunk_size=1024, probes=None, loads=None):
+        """
+        Generalized-alpha time integration with spectral radius `rho` and Rayleigh
+        damping C = alpha_1 * M + alpha_2 * K. The step size adapts when the local
+        error estimate lies between v1 * ne and v2 * ne. Steps that reuse a step size
+        only back-substitute with the cached Keff factors, see `self.factors`.
+        With an `output` directory u, v and a are streamed to memory-mapped .npy files
+        there, `chunk_size` steps at a time (see History.StreamingHistory), and
+        self.u, self.v and self.a become read-only maps of those files.
+        With `probes` (a History.Probes) only the probe channels are kept, resampled
+        to its uniform output grid in self.probes (name -> (channels, samples)) at
+        self.probe_time, together with online peak/RMS statistics of all DOFs in
+        self.statistics; self.u, self.v and self.a are then None.
+        `loads` (a LoadHistory) gives time-dependent loads R(t), taken at the
+        generalized midpoint (1 - alpha_f) R(t + dt) + alpha_f R(t) of every step;
+        without it the static load vector is applied suddenly and held constant.
+        """
+        # The sparse M and K are patched in place when element properties or
+        # coordinates change, refresh everything derived from them
+        if self._model_state() != self._state:
+            self._update_operators()
+        state = self._state
 
         # Time stepping parameters
         dt = initial_step
@@ -36,18 +87,21 @@ class dynamic:
         # Dynamic response parameters
         p = rho
 
-        # Allowable error boundaries
-        v1 = 0.5
-        v2 = 1
-        ne = 1e-2
-
         # Construct matrices and force vector
         M = self.M
         K = self.K
-        C = alpha_1 * M + alpha_2 * K
-
-        R = np.array(self.R)   # ensure it's an ndarray
-        R0 = R[:, 0].ravel()   # first load vector
+        # Rayleigh damping, formed once per coefficient pair by the operator layer
+        C = self.operators.C(alpha_1, alpha_2)
+        if not self.sparse:
+            C = C.toarray()
+
+        if loads is None:
+            R = np.array(self.R)   # ensure it's an ndarray
+            R0 = R[:, 0].ravel()   # first load vector
+        else:
+            # Sparse spatial patterns, built once for this DOF numbering
+            pattern = loads.pattern(self.dof_map, self.num_dof)
+            R0 = loads.evaluate(pattern, t)
 
         # Newmark parameters
         alpha_m = (2 * p - 1) / (p + 1)
@@ -58,88 +112,125 @@ class dynamic:
         # Determine total steps
         n_steps = int(np.ceil((t_end - t) / dt)) + 1
 
-        # Preallocate arrays
-        u = np.zeros((self.num_dof, n_steps))
-        v = np.zeros((self.num_dof, n_steps))
-        a = np.zeros((self.num_dof, n_steps))
-        r_eff = np.zeros((self.num_dof, n_steps))
-        e = np.zeros((self.num_dof, n_steps))
+        # Response histories, kept in memory or streamed to disk in chunks
+        if probes is not None:
+            if output is not None:
+                raise ValueError("Probes replace the full history, give either probes or an output directory.")
+            history = ProbeHistory(probes, self.dof_map, self.num_dof, t, t_end)
+        elif output is None:
+            history = MemoryHistory(self.num_dof, n_steps)
+        else:
+            history = StreamingHistory(output, self.num_dof, n_steps, chunk_size)
 
         et = np.zeros(n_steps)
         cet = np.zeros(n_steps)
         tn = np.zeros(n_steps)
         dtn = np.zeros(n_steps)
 
-        # Initial conditions
-        u[:, 0] = self.initial_displacement.ravel()
-        v[:, 0] = self.initial_velocity.ravel()
-        a[:, 0] = np.linalg.solve(M, R0 - C @ v[:, 0] - K @ u[:, 0])
+        # Initial conditions, the integrator only keeps the state of the current step
+        u_i = self.initial_displacement.ravel().astype(float)
+        v_i = self.initial_velocity.ravel().astype(float)
+        a_i = self._solve(M, R0 - C @ v_i - K @ u_i)
+        history.append(t, u_i, v_i, a_i)
         tn[0] = t
         dtn[0] = dt
 
-        # Time stepping loop
-        i = 0
-        while t < t_end and i + 1 < n_steps:
+        def factorize(dt):
             # Effective stiffness
             Km = (1 - alpha_m) / (B * dt ** 2)
             Kc = G * (1 - alpha_f) / (B * dt)
             Kk = (1 - alpha_f)
             Keff = M * Km + C * Kc + K * Kk
+            count_kernel("keff_factorization", 1)
+            record_matrix("Keff", Keff)
+            return DirectSolver(Keff) if self.sparse else la.lu_factor(Keff)
+
+        hits, misses = self.factors.hits, self.factors.misses
+
+        # Time stepping loop
+        i = 0
+        while t < t_end and i + 1 < n_steps:
+            factor = self.factors.get((state, dt, p, alpha_1, alpha_2), lambda: factorize(dt))
 
             # Effective load vector
-            rk = alpha_f * u[:, i]
+            rk = alpha_f * u_i
             rcu = G * (1 - alpha_f) / (B * dt)
             rcv = (G - G * alpha_f - B) / B
             rca = (G - 2 * B) * (1 - alpha_f) / (2 * B) * dt
-            rc = rcu * u[:, i] + rcv * v[:, i] + rca * a[:, i]
+            rc = rcu * u_i + rcv * v_i + rca * a_i
 
             rmu = (1 - alpha_m) / (B * dt ** 2)
             rmv = (1 - alpha_m) / (B * dt)
             rma = (1 - alpha_m - 2 * B) / (2 * B)
-            rm = rmu * u[:, i] + rmv * v[:, i] + rma * a[:, i]
+            rm = rmu * u_i + rmv * v_i + rma * a_i
+
+            # Load vector for this step
+            if loads is None:
+                R_t = R0
+            else:
+                R_t = (1 - alpha_f) * loads.evaluate(pattern, t + dt) + alpha_f * loads.evaluate(pattern, t)
 
-            # Pick load vector for this step
-            R_t = R0   # use column i of your load matrix
-            
-            r_eff[:, i+1] = R_t - K @ rk + C @ rc + M @ rm
+            r_eff = R_t - K @ rk + C @ rc + M @ rm
 
             # Update motion
-            u[:, i+1] = np.linalg.solve(Keff, r_eff[:, i+1])
-            v[:, i+1] = (G / (B * dt)) * (u[:, i+1] - u[:, i]) \
-                        - (G - B) / B * v[:, i] \
-                        - (G - 2 * B) / (2 * B) * dt * a[:, i]
-            a[:, i+1] = (1 / (B * dt ** 2)) * (u[:, i+1] - u[:, i]) \
-                        - (1 / (B * dt)) * v[:, i] \
-                        - (1 - 2 * B) / (2 * B) * a[:, i]
+            u_next = factor.solve(r_eff) if self.sparse else la.lu_solve(factor, r_eff)
+            v_next = (G / (B * dt)) * (u_next - u_i) \
+                     - (G - B) / B * v_i \
+                     - (G - 2 * B) / (2 * B) * dt * a_i
+            a_next = (1 / (B * dt ** 2)) * (u_next - u_i) \
+                     - (1 / (B * dt)) * v_i \
+                     - (1 - 2 * B) / (2 * B) * a_i
 
             # Error calculations
-            e[:, i] = (6 * B - 1) / 6 * (a[:, i+1] - a[:, i]) * dt ** 2
-            if np.linalg.norm(u[:, i+1] - u[:, i]) != 0:
-                et[i] = np.linalg.norm(e[:, i]) / np.linalg.norm(u[:, i+1] - u[:, i])
-            cet[i+1] = cet[i] + np.linalg.norm(e[:, i])
-
-            # Adaptive dt
-            if v2 * ne > et[i] > v1 * ne:
-                dt = dt * np.sqrt(ne / et[i])
-
-            # Update time trackers
-            t += dt
+            e = (6 * B - 1) / 6 * (a_next - a_i) * dt ** 2
+            if np.linalg.norm(u_next - u_i) != 0:
+                et[i] = np.linalg.norm(e) / np.linalg.norm(u_next - u_i)
+            cet[i+1] = cet[i] + np.linalg.norm(e)
+
+            # Advance the state and the time by the step just integrated
+            dt_used = dt
+            u_i, v_i, a_i = u_next, v_next, a_next
+            t += dt_used
             i += 1
             tn[i] = t
-            dtn[i] = dt
+            dtn[i] = dt_used
+            history.append(t, u_i, v_i, a_i)
+
+            # Adaptive dt for the next step
+            if v2 * ne > et[i-1] > v1 * ne:
+                dt = dt_used * np.sqrt(ne / et[i-1])
+
+        record_matrix("M", M)
+        record_matrix("K", K)
+        record_matrix("C", C)
+        logger.info("Keff factor cache: %d hits, %d misses over %d steps",
+                    self.factors.hits - hits, self.factors.misses - misses, i)
 
-        # Final results
-        self.u, self.v, self.a = u[:, :i+1], v[:, :i+1], a[:, :i+1]
+        # Final results, memory-mapped and read lazily when streamed
         self.time = tn[:i+1]
         self.dt_hist = dtn[:i+1]
         self.errors = et[:i+1]
-        print("Displacement history:")
-        print(self.u)
+        self.u, self.v, self.a = history.close(self.time, self.dt_hist, self.errors)
+        if probes is not None:
+            self.probe_time, self.probes = history.output_time, history.channels
+            self.statistics = history.statistics
+        logger.debug("Displacement history:\n%s", self.u)
         return
 
+    def _solve(self, A, b):
+        """
+        One-off solve A x = b with a sparse or dense A. The sparse matrix is the
+        consistent mass, which stays well conditioned, so Jacobi-preconditioned CG
+        converges in a few iterations where a sparse LU would fill in.
+        """
+        if sp.issparse(A):
+            return IterativeSolver(A, preconditioner="jacobi", tol=1e-14).solve(b)
+        return np.linalg.solve(A, b)
+
     def plot_results(self, dof_index=0):
         """
         Plot displacement, velocity, and acceleration for the given DOF index.
+        Streamed histories are memory-mapped, only this DOF's rows are read.
         """
         # Map solver outputs to histories for a single DOF
         time_history = self.time
@@ -1,4 +1,6 @@
 from Node import Node
+from Tables import ElementTable
+import Kernels
 import pandas as pd
 import numpy as np
 class Element:
@@ -7,57 +9,82 @@ class Element:
         """
         Initialize an Element object with two nodes.
         """
-        # Material properties
-        self.area = area
-        self.density = density
-        self.e_modulus = e_modulus
+        # A standalone element owns a one-row table and keeps its node objects;
+        # elements of a Structure are views that resolve nodes through the connectivity
+        self._table = ElementTable(None, capacity=1)
+        self._index = self._table.append([-1, -1], e_modulus, area, density)
         #self.print_propwhereerties()
         
         # Set nodes
-        self.node1 = node1
-        self.node2 = node2
+        self._nodes = (node1, node2)
         #self.print_nodes()
-        
-        
-    
-    def __str__(self):
-        return f"Element(area={self.area}, e_modulus={self.e_modulus}, node1={self.node1}, node2={self.node2})"
-        
-    
-    def compute_stiffness_matrix(self):
+
+    @classmethod
+    def view(cls, table, index):
         """
-        Compute the 6x6 stiffness matrix for a 3D truss element using dyadic form.
+        Create a thin Element view over row `index` of an ElementTable.
+        """
+        element = cls.__new__(cls)
+        element._table = table
+        element._index = int(index)
+        element._nodes = None
+        return element
+
+    @property
+    def index(self):
+        """
+        Row of this element in its table.
         """
-        x1 = np.array(self.node1.get_position())
-        x2 = np.array(self.node2.get_position())
+        return self._index
 
-        # Element length
-        L_vec = x2 - x1
-        L = np.linalg.norm(L_vec)
+    @property
+    def node1(self):
+        if self._nodes is not None:
+            return self._nodes[0]
+        return Node.view(self._table.node_table, self._table.connectivity[self._index, 0])
 
-        if L == 0:
-            raise ValueError("Element length is zero — nodes are overlapping.")
+    @property
+    def node2(self):
+        if self._nodes is not None:
+            return self._nodes[1]
+        return Node.view(self._table.node_table, self._table.connectivity[self._index, 1])
 
-        # Unit direction vector
-        direction = L_vec / L
+    @property
+    def area(self):
+        return self._table.area[self._index]
 
-        # Outer product (3x3)
-        outer = np.outer(direction, direction)
+    @area.setter
+    def area(self, area):
+        self._table.area[self._index] = area
+        self._table.modified("area", rows=[self._index])
 
-        # Scale factor
-        scale = (self.e_modulus * self.area) / L
+    @property
+    def density(self):
+        return self._table.density[self._index]
 
-        # Assemble the 6x6 stiffness matrix
-        # Using block matrix form:
-        # [ K  -K ]
-        # [ -K  K ]
+    @density.setter
+    def density(self, density):
+        self._table.density[self._index] = density
+        self._table.modified("density", rows=[self._index])
 
-        K = scale * outer  # 3x3 local stiffness
+    @property
+    def e_modulus(self):
+        return self._table.e_modulus[self._index]
 
-        k_local = np.block([
-            [ K, -K],
-            [-K,  K]
-        ])
+    @e_modulus.setter
+    def e_modulus(self, e_modulus):
+        self._table.e_modulus[self._index] = e_modulus
+        self._table.modified("e_modulus", rows=[self._index])
+    
+    def __str__(self):
+        return f"Element(area={self.area}, e_modulus={self.e_modulus}, node1={self.node1}, node2={self.node2})"
+        
+    
+    def compute_stiffness_matrix(self):
+        """
+        Compute the 6x6 stiffness matrix for a 3D truss element using dyadic form.
+        """
+        k_local = Kernels.stiffness_blocks(self._coordinates(), [[0, 1]], self.e_modulus, self.area)[0]
 
         self.stiffness_matrix = k_local
         return k_local
@@ -66,42 +93,22 @@ class Element:
         """
         Compute the 6x6 mass matrix using information from the nodes
         """
-        x1 = np.array(self.node1.get_position())
-        x2 = np.array(self.node2.get_position())
-        
-        # Element length
-        L_vec = x2 - x1
-        L = np.linalg.norm(L_vec)
-        
-        # Scale factor
-        scale = L  * self.density * self.area / 6
-        
-        # Construct the local mass matrix for linear element
-        m11 = scale * 2
-        m12 = scale
-        m21 = m12
-        m22 = m11
-        
-        m = np.block([
-            [m11, m12],
-            [m21, m22]
-        ])
-        
-        # Transform the local to global m matrix
-        T = self.transformation_matrix()
-        m_local = np.transpose(T) @ m @ T
+        m_local = Kernels.mass_blocks(self._coordinates(), [[0, 1]], self.density, self.area)[0]
         
         self.mass_matrix = m_local
-        df = pd.DataFrame(m_local)
-        print(df)
         return m_local 
     
+    def _coordinates(self):
+        """
+        Stack the positions of both nodes into a (2, 3) array for the batched kernels.
+        """
+        return np.array([self.node1.get_position(), self.node2.get_position()], dtype=float)
     
     def enumerate_dof(self):
         """
         Calculate the whole degrees of freedom for the element.
         """
-        return self.node1.dof_number + self.node2.dof_number
+        return list(self.node1.dof_number) + list(self.node2.dof_number)
     
     def compute_force(self):
         """"
@@ -165,32 +172,7 @@ class Element:
         """
         Compute the 6x6 transformation matrix for a 3D truss element.
         """
-        # Get node coordinates
-        x1, y1, z1 = self.node1.position
-        x2, y2, z2 = self.node2.position
-
-        # Element direction vector
-        dx = x2 - x1
-        dy = y2 - y1
-        dz = z2 - z1
-        L = np.sqrt(dx**2 + dy**2 + dz**2)
-        
-        if L == 0:
-            raise ValueError("Element has zero length")
-
-        # Direction cosines
-        l = dx / L
-        m = dy / L
-        n = dz / L
-
-        # Construct transformation matrix
-        T = np.zeros((6, 2))
-        
-        T = np.array([
-            [l, m, n, 0, 0, 0],
-            [0, 0, 0, l, m, n]
-        ])
-        return T
+        return Kernels.transformation_matrices(self._coordinates(), [[0, 1]])[0]
     
     def get_length_transformation(self):
         # Get node coordinates
@@ -211,25 +193,11 @@ class Element:
         Compute internal force vector in local coordinates.
         """
         # Get DOF mapping
-        dof_map = self.node1.dof_number + self.node2.dof_number  # 6 DOFs
-
-        # Extract global displacement vector for this element
-        u_global = np.zeros(6)
-        for i, dof in enumerate(dof_map):
-            if dof != -1:
-                u_global[i] = U_global[dof]
-        #print("My U global: ")
-        #print(u_global)
-
-        # Transform to local coordinate system
-        T = self.transformation_matrix()  # 6x2
-        u_local = T @ np.transpose(u_global)
+        dof_map = [self.enumerate_dof()]  # 6 DOFs
 
-        # Compute internal force vector (in local coords)
-        f_local_component = np.array(self.area / self.get_length_transformation() * self.e_modulus * u_local)
-        f_local = f_local_component[1] - f_local_component[0]
-        #print("My iternal force vector:")
-        #print(f_local)
+        # Axial force from the projected elongation of the element
+        U_global = np.asarray(U_global, dtype=float).ravel()
+        f_local = Kernels.axial_forces(self._coordinates(), [[0, 1]], self.e_modulus, self.area, dof_map, U_global)[0]
         return f_local
     
     def print_nodes(self):
@@ -0,0 +1,303 @@
+import math as mat
+import numpy as np
+from Structure import Structure
+
+# Default steel members of the example models: E [Pa], area of a 20 mm radius bar [m^2], density [kg/m^3]
+E_MODULUS = 2.1e11
+AREA = mat.pi * 0.02 ** 2
+DENSITY = 7850
+# Tube of Tetrahedral_test: 457.2 mm outer diameter, 10 mm wall
+TUBE_AREA = mat.pi * ((457.2 / 2000) ** 2 - (457.2 / 2000 - 0.01) ** 2)
+
+def _build(coordinates, connectivity, e_modulus, area, density):
+    """
+    Create a structure from node coordinates and element connectivity in bulk.
+    """
+    structure = Structure()
+    structure.add_nodes(coordinates)
+    structure.add_elements(connectivity, e_modulus, area, density)
+    return structure
+
+def tetrahedron(edge=15.0, load=(0.0, -20e3, -100e3), e_modulus=E_MODULUS, area=TUBE_AREA,
+                density=DENSITY):
+    """
+    The tetrahedral benchmark of Tetrahedral_test: a regular tetrahedron of tubes with
+    two fixed base nodes, one base node free in-plane and the apex loaded.
+    """
+    coordinates = [
+        [0.0, 0.0, edge * mat.sqrt(2 / 3)],
+        [0.0, edge / mat.sqrt(3), 0.0],
+        [-edge / 2, -edge / mat.sqrt(12), 0.0],
+        [edge / 2, -edge / mat.sqrt(12), 0.0],
+    ]
+    connectivity = [[0, 1], [0, 2], [0, 3], [1, 2], [2, 3], [3, 1]]
+    structure = _build(coordinates, connectivity, e_modulus, area, density)
+    structure.set_constraints([1, 2], [True, True, True])
+    structure.set_constraints([3], [False, False, True])
+    structure.set_forces([0], load)
+    return structure
+
+def _bridge_supports(structure, left, right, supports):
+    """
+    Pin the `left` support nodes and pin or roller (free along the span) the `right` ones.
+    """
+    if supports not in ("pinned-roller", "pinned-pinned"):
+        raise ValueError(f"Unknown supports '{supports}', expected 'pinned-roller' or 'pinned-pinned'.")
+    structure.set_constraints(left, [True, True, True])
+    structure.set_constraints(right, [supports == "pinned-pinned", True, True])
+
+def _load_nodes(pattern, nodes, distributed=("deck", "top")):
+    """
+    Pick the loaded nodes of a generator: all of `nodes` for one of the `distributed`
+    patterns, the middle one for "midspan" and none for None. Any other pattern raises.
+    """
+    if pattern is None:
+        return nodes[:0]
+    if pattern == "midspan":
+        return nodes[[len(nodes) // 2]]
+    if pattern in distributed:
+        return nodes
+    expected = ", ".join(f"'{name}'" for name in distributed + ("midspan",))
+    raise ValueError(f"Unknown load pattern '{pattern}', expected {expected} or None.")
+
+def planar_bridge(kind, span, n_bays, depth=None, supports="pinned-roller", load=-500e3, load_pattern="deck",
+                  e_modulus=E_MODULUS, area=AREA, density=DENSITY):
+    """
+    Planar truss bridge in the x-y plane like Bridge_Case, with out-of-plane DOFs fixed.
+    `kind` is "warren" (top chord nodes above the bay centres and alternating diagonals),
+    "pratt" (verticals, diagonals falling towards midspan) or "howe" (verticals,
+    diagonals rising towards midspan). `supports` is "pinned-roller" or "pinned-pinned".
+    The vertical `load` is applied per node on the interior bottom chord ("deck"),
+    the top chord ("top"), the bottom chord node at "midspan" or nowhere (None).
+    """
+    if kind not in ("warren", "pratt", "howe"):
+        raise ValueError(f"Unknown bridge type '{kind}', expected 'warren', 'pratt' or 'howe'.")
+    if n_bays < (1 if kind == "warren" else 2):
+        raise ValueError(f"A {kind} bridge needs at least {1 if kind == 'warren' else 2} bays.")
+    panel = span / n_bays
+    if depth is None:
+        # Equilateral triangles for a Warren truss, square panels otherwise
+        depth = panel * mat.sqrt(3) / 2 if kind == "warren" else panel
+
+    bottom = np.arange(n_bays + 1)
+    if kind == "warren":
+        top_x = (np.arange(n_bays) + 0.5) * panel
+    else:
+        top_x = np.arange(1, n_bays) * panel
+    top = n_bays + 1 + np.arange(len(top_x))
+    coordinates = np.zeros((len(bottom) + len(top), 3))
+    coordinates[bottom, 0] = bottom * panel
+    coordinates[top, 0] = top_x
+    coordinates[top, 1] = depth
+
+    connectivity = [np.c_[bottom[:-1], bottom[1:]], np.c_[top[:-1], top[1:]]]   # chords
+    if kind == "warren":
+        connectivity += [np.c_[bottom[:-1], top], np.c_[top, bottom[1:]]]
+    else:
+        connectivity += [
+            np.c_[bottom[1:-1], top],                                       # verticals
+            [[bottom[0], top[0]], [bottom[-1], top[-1]]],                   # end posts
+        ]
+        # Interior bay j lies between bottom nodes j and j + 1, below top[j - 1] and top[j]
+        j = np.arange(1, n_bays - 1)
+        left = j + 0.5 < n_bays / 2
+        if kind == "pratt":
+            connectivity.append(np.where(left[:, None], np.c_[top[j - 1], bottom[j + 1]], np.c_[top[j], bottom[j]]))
+        else:
+            connectivity.append(np.where(left[:, None], np.c_[bottom[j], top[j]], np.c_[bottom[j + 1], top[j - 1]]))
+    structure = _build(coordinates, np.vstack(connectivity), e_modulus, area, density)
+
+    structure.set_constraints(np.arange(len(coordinates)), [False, False, True])
+    _bridge_supports(structure, [bottom[0]], [bottom[-1]], supports)
+    loaded = _load_nodes(load_pattern, top if load_pattern == "top" else bottom[1:-1])
+    if len(loaded):
+        structure.set_forces(loaded, [0.0, load, 0.0])
+    return structure
+
+def warren_bridge(span, n_bays, depth=None, **options):
+    """
+    Planar Warren bridge, see planar_bridge.
+    """
+    return planar_bridge("warren", span, n_bays, depth, **options)
+
+def pratt_bridge(span, n_bays, depth=None, **options):
+    """
+    Planar Pratt bridge, see planar_bridge.
+    """
+    return planar_bridge("pratt", span, n_bays, depth, **options)
+
+def howe_bridge(span, n_bays, depth=None, **options):
+    """
+    Planar Howe bridge, see planar_bridge.
+    """
+    return planar_bridge("howe", span, n_bays, depth, **options)
+
+def box_girder(span, n_bays, width, depth, supports="pinned-roller", load=-100e3, load_pattern="deck",
+               e_modulus=E_MODULUS, area=AREA, density=DENSITY):
+    """
+    3D box girder along x with y up: four chords, a braced rectangular cross-section
+    (transverse members, verticals and one section diagonal) at every station and
+    alternating diagonals in the two side faces, the top and the bottom face.
+    Both bottom nodes of the first station are pinned, those of the last station pinned
+    or on rollers along the span. The vertical `load` acts per node on the interior
+    bottom nodes ("deck"), the top nodes ("top"), the middle station ("midspan") or nowhere.
+    """
+    if n_bays < 1:
+        raise ValueError("A box girder needs at least one bay.")
+    stations = np.arange(n_bays + 1)
+    # Corner c of station i is node 4 * i + c: bottom near, bottom far, top near, top far
+    corners = np.array([[0.0, 0.0], [0.0, width], [depth, 0.0], [depth, width]])
+    coordinates = np.zeros((n_bays + 1, 4, 3))
+    coordinates[:, :, 0] = (stations * span / n_bays)[:, None]
+    coordinates[:, :, 1:] = corners
+    node = 4 * stations[:, None] + np.arange(4)
+
+    even = (stations[:-1] % 2 == 0)[:, None]
+    def face_diagonals(a, b):
+        # Alternate the diagonal of the face spanned by corners a and b from bay to bay
+        return np.where(even, np.c_[node[:-1, a], node[1:, b]], np.c_[node[:-1, b], node[1:, a]])
+
+    connectivity = [np.c_[node[:-1, c], node[1:, c]] for c in range(4)]                          # chords
+    connectivity += [np.c_[node[:, a], node[:, b]] for a, b in ((0, 1), (2, 3), (0, 2), (1, 3), (0, 3))]  # sections
+    connectivity += [face_diagonals(a, b) for a, b in ((0, 2), (1, 3), (2, 3), (0, 1))]
+    structure = _build(coordinates.reshape(-1, 3), np.vstack(connectivity), e_modulus, area, density)
+
+    _bridge_supports(structure, node[0, :2], node[-1, :2], supports)
+    if load_pattern == "top":
+        loaded = node[:, 2:].ravel()
+    elif load_pattern == "midspan":
+        loaded = node[n_bays // 2, :2]
+    else:
+        loaded = _load_nodes(load_pattern, node[1:-1, :2].ravel())
+    if len(loaded):
+        structure.set_forces(loaded, [0.0, load, 0.0])
+    return structure
+
+def lattice_tower(height, n_levels, base_width, top_width=None, load=(10e3, 0.0, 0.0), load_pattern="top",
+                  e_modulus=E_MODULUS, area=AREA, density=DENSITY):
+    """
+    Square lattice tower along z, tapering linearly from `base_width` to `top_width`:
+    four legs, a horizontal ring and one plan diagonal at every level and X-bracing in
+    every face panel. The base nodes are fixed. `load` acts per node on the top level
+    ("top"), on every level above the base ("levels", e.g. wind) or nowhere (None).
+    """
+    if n_levels < 1:
+        raise ValueError("A lattice tower needs at least one level.")
+    top_width = base_width if top_width is None else top_width
+    levels = np.arange(n_levels + 1)
+    widths = base_width + (top_width - base_width) * levels / n_levels
+    # Corners counter-clockwise, corner c of level k is node 4 * k + c
+    signs = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]]) / 2
+    coordinates = np.zeros((n_levels + 1, 4, 3))
+    coordinates[:, :, :2] = widths[:, None, None] * signs
+    coordinates[:, :, 2] = (height * levels / n_levels)[:, None]
+    node = 4 * levels[:, None] + np.arange(4)
+    following = np.roll(np.arange(4), -1)
+
+    connectivity = [
+        np.c_[node[:-1].ravel(), node[1:].ravel()],                        # legs
+        np.c_[node[1:].ravel(), node[1:, following].ravel()],              # rings
+        np.c_[node[1:, 0], node[1:, 2]],                                   # plan diagonals
+        np.c_[node[:-1].ravel(), node[1:, following].ravel()],             # X-bracing
+        np.c_[node[:-1, following].ravel(), node[1:].ravel()],
+    ]
+    structure = _build(coordinates.reshape(-1, 3), np.vstack(connectivity), e_modulus, area, density)
+
+    structure.set_constraints(node[0], [True, True, True])
+    if load_pattern == "top":
+        structure.set_forces(node[-1], load)
+    elif load_pattern == "levels":
+        structure.set_forces(node[1:].ravel(), load)
+    elif load_pattern is not None:
+        raise ValueError(f"Unknown load pattern '{load_pattern}', expected 'top', 'levels' or None.")
+    return structure
+
+def double_layer_grid(nx, ny, spacing, depth, supports="perimeter", load=-10e3, load_pattern="top",
+                      e_modulus=E_MODULUS, area=AREA, density=DENSITY):
+    """
+    Square-on-square offset double-layer grid in the x-y plane: an (nx + 1) x (ny + 1)
+    top grid at z = depth, an nx x ny bottom grid below the cell centres and four web
+    members from every bottom node to the corners of its cell. The top perimeter nodes
+    ("perimeter") or only the four corners ("corners") are pinned. The vertical `load`
+    acts per node on the top grid ("top") or nowhere (None).
+    """
+    if nx < 1 or ny < 1:
+        raise ValueError("A double-layer grid needs at least one cell in every direction.")
+    top = np.arange((nx + 1) * (ny + 1)).reshape(nx + 1, ny + 1)
+    bottom = top.size + np.arange(nx * ny).reshape(nx, ny)
+
+    i, j = np.meshgrid(np.arange(nx + 1), np.arange(ny + 1), indexing="ij")
+    top_coordinates = np.stack([i * spacing, j * spacing, np.full(i.shape, float(depth))], axis=-1)
+    i, j = np.meshgrid(np.arange(nx) + 0.5, np.arange(ny) + 0.5, indexing="ij")
+    bottom_coordinates = np.stack([i * spacing, j * spacing, np.zeros(i.shape)], axis=-1)
+    coordinates = np.vstack([top_coordinates.reshape(-1, 3), bottom_coordinates.reshape(-1, 3)])
+
+    connectivity = [
+        np.c_[top[:-1].ravel(), top[1:].ravel()], np.c_[top[:, :-1].ravel(), top[:, 1:].ravel()],
+        np.c_[bottom[:-1].ravel(), bottom[1:].ravel()], np.c_[bottom[:, :-1].ravel(), bottom[:, 1:].ravel()],
+    ]
+    connectivity += [np.c_[bottom.ravel(), corner.ravel()]
+                     for corner in (top[:-1, :-1], top[1:, :-1], top[:-1, 1:], top[1:, 1:])]
+    structure = _build(coordinates, np.vstack(connectivity), e_modulus, area, density)
+
+    if supports == "perimeter":
+        edge = np.zeros(top.shape, dtype=bool)
+        edge[[0, -1], :] = edge[:, [0, -1]] = True
+        supported = top[edge]
+    elif supports == "corners":
+        supported = top[[0, 0, -1, -1], [0, -1, 0, -1]]
+    else:
+        raise ValueError(f"Unknown supports '{supports}', expected 'perimeter' or 'corners'.")
+    structure.set_constraints(supported, [True, True, True])
+    if load_pattern == "top":
+        structure.set_forces(top.ravel(), [0.0, 0.0, load])
+    elif load_pattern is not None:
+        raise ValueError(f"Unknown load pattern '{load_pattern}', expected 'top' or None.")
+    return structure
+
+def space_lattice(nx, ny=None, nz=None, spacing=1.0, load=(1e3, 0.0, -1e3),
+                  e_modulus=E_MODULUS, area=AREA, density=DENSITY):
+    """
+    3D space lattice of nx * ny * nz nodes on a regular grid with edge members,
+    one face diagonal per cell face orientation and one body diagonal per cell.
+    The bottom layer (z = 0) is fixed and every node of the top layer carries `load`.
+    """
+    ny = nx if ny is None else ny
+    nz = nx if nz is None else nz
+    if min(nx, ny, nz) < 2:
+        raise ValueError("A space lattice needs at least two nodes in every direction.")
+
+    grid = np.stack(np.meshgrid(np.arange(nx), np.arange(ny), np.arange(nz), indexing="ij"), axis=-1)
+    coordinates = grid.reshape(-1, 3) * float(spacing)
+    index = np.arange(nx * ny * nz).reshape(nx, ny, nz)
+
+    connectivity = []
+    for axis in range(3):
+        a = np.moveaxis(index, axis, 0)
+        connectivity.append(np.c_[a[:-1].ravel(), a[1:].ravel()])
+    connectivity += [
+        np.c_[index[:-1, :-1, :].ravel(), index[1:, 1:, :].ravel()],
+        np.c_[index[:, :-1, :-1].ravel(), index[:, 1:, 1:].ravel()],
+        np.c_[index[:-1, :, :-1].ravel(), index[1:, :, 1:].ravel()],
+        np.c_[index[:-1, :-1, :-1].ravel(), index[1:, 1:, 1:].ravel()],
+    ]
+    structure = _build(coordinates, np.vstack(connectivity), e_modulus, area, density)
+
+    structure.set_constraints(index[:, :, 0].ravel(), [True, True, True])
+    structure.set_forces(index[:, :, -1].ravel(), load)
+    return structure
+
+def warren_panels_for_dofs(num_dof):
+    """
+    Number of Warren bridge bays giving about `num_dof` free DOFs (4 per bay).
+    """
+    return max(1, int(round((num_dof + 1) / 4)))
+
+def lattice_size_for_dofs(num_dof):
+    """
+    Nodes per direction of a cubic space lattice giving about `num_dof` free DOFs.
+    """
+    n = 2
+    while 3 * n * n * (n - 1) < num_dof:
+        n += 1
+    return n
@@ -0,0 +1,275 @@
+import json
+import os
+import numpy as np
+
+FIELDS = ("u", "v", "a")
+
+class MemoryHistory:
+    def __init__(self, num_dof, capacity):
+        """
+        In-memory response history: u, v and a as preallocated
+        (num_dof, capacity) arrays, filled one step (column) at a time.
+        """
+        self.num_dof = num_dof
+        self.capacity = capacity
+        self.arrays = {name: np.zeros((num_dof, capacity)) for name in FIELDS}
+        self.count = 0
+
+    def append(self, t, u, v, a):
+        """
+        Store the state of the next step at time `t`.
+        """
+        if self.count == self.capacity:
+            raise IndexError(f"The history holds at most {self.capacity} steps.")
+        for name, values in zip(FIELDS, (u, v, a)):
+            self.arrays[name][:, self.count] = values
+        self.count += 1
+
+    def close(self, time, dt_hist, errors):
+        """
+        Get the (u, v, a) histories of the stored steps.
+        """
+        return tuple(self.arrays[name][:, :self.count] for name in FIELDS)
+
+class StreamingHistory:
+    def __init__(self, directory, num_dof, capacity, chunk_size=1024):
+        """
+        On-disk response history for long transient runs. The steps are buffered
+        `chunk_size` at a time and written to memory-mapped u.npy, v.npy and a.npy
+        files of shape (num_dof, capacity) in `directory`, so only the current chunk
+        is held in memory. The files are only mapped while a chunk is written, so
+        the written pages do not pile up in the process memory. The DOF-major layout
+        keeps the history of one DOF contiguous on disk for plotting. Steps beyond
+        the last written one are never touched, so the unused capacity stays a
+        sparse hole in the file.
+        """
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be at least one step.")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.num_dof = num_dof
+        self.capacity = capacity
+        self.chunk_size = chunk_size
+        self.paths = {name: os.path.join(directory, f"{name}.npy") for name in FIELDS}
+        for path in self.paths.values():
+            # Write the header and size the file
+            np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=(num_dof, capacity)).flush()
+        self.buffers = {name: np.empty((num_dof, chunk_size)) for name in FIELDS}
+        self.count = 0
+        self._buffered = 0
+
+    def append(self, t, u, v, a):
+        """
+        Buffer the state of the next step at time `t`, writing the chunk out when it is full.
+        """
+        if self.count + self._buffered == self.capacity:
+            raise IndexError(f"The history holds at most {self.capacity} steps.")
+        for name, values in zip(FIELDS, (u, v, a)):
+            self.buffers[name][:, self._buffered] = values
+        self._buffered += 1
+        if self._buffered == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered steps to disk.
+        """
+        if self._buffered == 0:
+            return
+        end = self.count + self._buffered
+        for name in FIELDS:
+            stored = np.load(self.paths[name], mmap_mode="r+")
+            stored[:, self.count:end] = self.buffers[name][:, :self._buffered]
+            stored.flush()
+            del stored
+        self.count = end
+        self._buffered = 0
+
+    def close(self, time, dt_hist, errors):
+        """
+        Flush the last chunk, store the time, step size and error histories next to
+        the responses and get read-only memory-mapped (u, v, a) histories.
+        """
+        self.flush()
+        np.save(os.path.join(self.directory, "time.npy"), np.asarray(time))
+        np.save(os.path.join(self.directory, "dt.npy"), np.asarray(dt_hist))
+        np.save(os.path.join(self.directory, "errors.npy"), np.asarray(errors))
+        with open(os.path.join(self.directory, "history.json"), "w") as file:
+            json.dump({"num_dof": self.num_dof, "steps": self.count, "capacity": self.capacity}, file)
+        self.buffers = {}
+        return load_history(self.directory)[:3]
+
+class Probes:
+    def __init__(self, interval=None, rate=None):
+        """
+        Response probes for a dynamic run: named node/DOF selections recorded on a
+        uniform output grid with spacing `interval`, or `rate` samples per second,
+        instead of the full history at every (adaptive) step.
+        """
+        if (interval is None) == (rate is None):
+            raise ValueError("Give exactly one of the output interval and the sampling rate.")
+        interval = 1.0 / rate if interval is None else interval
+        if interval <= 0:
+            raise ValueError("The output interval must be positive.")
+        self.interval = float(interval)
+        self.selections = {}
+
+    def add(self, name, nodes=None, directions=(0, 1, 2), dofs=None, quantity="u"):
+        """
+        Register the channel `name` recording `quantity` ("u", "v" or "a") either of
+        the `directions` (0 = x, 1 = y, 2 = z) of `nodes`, or of the global `dofs`.
+        Node channels are ordered node by node; constrained directions read zero.
+        """
+        if quantity not in FIELDS:
+            raise ValueError(f"Unknown quantity '{quantity}', expected one of {FIELDS}.")
+        if (nodes is None) == (dofs is None):
+            raise ValueError("Select either nodes or DOFs for a probe.")
+        directions = np.atleast_1d(np.asarray(directions, dtype=np.int64))
+        if np.any((directions < 0) | (directions > 2)):
+            raise ValueError("Probe directions must be 0 (x), 1 (y) or 2 (z).")
+        self.selections[name] = (quantity, nodes, directions, dofs)
+        return self
+
+    def resolve(self, dof_map, num_dof):
+        """
+        Get {name: (quantity, dofs)} with the global DOF of every channel,
+        -1 for constrained directions.
+        """
+        channels = {}
+        for name, (quantity, nodes, directions, dofs) in self.selections.items():
+            if dofs is None:
+                nodes = np.atleast_1d(np.asarray(nodes, dtype=np.int64))
+                if np.any((nodes < 0) | (nodes >= len(dof_map))):
+                    raise IndexError(f"Probe '{name}' selects a node outside 0..{len(dof_map) - 1}.")
+                dofs = dof_map[nodes][:, directions].ravel()
+            else:
+                dofs = np.atleast_1d(np.asarray(dofs, dtype=np.int64))
+                if np.any((dofs < 0) | (dofs >= num_dof)):
+                    raise IndexError(f"Probe '{name}' selects a DOF outside 0..{num_dof - 1}.")
+            channels[name] = (quantity, dofs)
+        return channels
+
+class ResponseStatistics:
+    def __init__(self, num_dof):
+        """
+        Online statistics of u, v and a over all DOFs: the signed extremes, the
+        absolute peak and its time, and the time-weighted RMS (trapezoidal rule,
+        so adaptive steps are weighted by their length).
+        """
+        self.num_dof = num_dof
+        self.maximum = {name: np.full(num_dof, -np.inf) for name in FIELDS}
+        self.minimum = {name: np.full(num_dof, np.inf) for name in FIELDS}
+        self.peak = {name: np.zeros(num_dof) for name in FIELDS}
+        self.peak_time = {name: np.zeros(num_dof) for name in FIELDS}
+        self._square_integral = {name: np.zeros(num_dof) for name in FIELDS}
+        self._last_square = {}
+        self.start_time = None
+        self.last_time = None
+
+    def update(self, t, u, v, a):
+        """
+        Add the state at time `t`.
+        """
+        for name, values in zip(FIELDS, (u, v, a)):
+            np.maximum(self.maximum[name], values, out=self.maximum[name])
+            np.minimum(self.minimum[name], values, out=self.minimum[name])
+            magnitude = np.abs(values)
+            higher = magnitude > self.peak[name]
+            self.peak[name][higher] = magnitude[higher]
+            self.peak_time[name][higher] = t
+            square = values * values
+            if self.last_time is not None:
+                self._square_integral[name] += 0.5 * (t - self.last_time) * (self._last_square[name] + square)
+            self._last_square[name] = square
+        if self.start_time is None:
+            self.start_time = t
+        self.last_time = t
+
+    def rms(self, quantity="u"):
+        """
+        Time-weighted root mean square of `quantity` per DOF.
+        """
+        duration = self.last_time - self.start_time if self.last_time is not None else 0.0
+        if duration <= 0:
+            return np.sqrt(self._last_square.get(quantity, np.zeros(self.num_dof)))
+        return np.sqrt(self._square_integral[quantity] / duration)
+
+    def report(self, quantity="u"):
+        """
+        Get {"max", "min", "peak", "peak_time", "rms"} arrays of `quantity` per DOF.
+        """
+        return {
+            "max": self.maximum[quantity], "min": self.minimum[quantity], "peak": self.peak[quantity],
+            "peak_time": self.peak_time[quantity], "rms": self.rms(quantity),
+        }
+
+class ProbeHistory:
+    def __init__(self, probes, dof_map, num_dof, start_time, end_time):
+        """
+        Probe-only response history: keeps the probe channels, linearly interpolated
+        from the adaptive steps onto the uniform output grid start_time + k * interval
+        up to `end_time`, and the online statistics of all DOFs.
+        """
+        self.interval = probes.interval
+        self.start_time = start_time
+        n_out = int(np.floor((end_time - start_time) / self.interval * (1 + 1e-12))) + 1
+        self.output_time = start_time + self.interval * np.arange(n_out)
+        self.channels = {}
+        self._channels = {}
+        for name, (quantity, dofs) in probes.resolve(dof_map, num_dof).items():
+            self.channels[name] = np.zeros((len(dofs), n_out))
+            self._channels[name] = (FIELDS.index(quantity), np.maximum(dofs, 0), dofs >= 0)
+        self.statistics = ResponseStatistics(num_dof)
+        self.count = 0
+        self._next = 0
+        self._last = None
+
+    def _sample(self, state):
+        return {name: np.where(mask, state[field][dofs], 0.0)
+                for name, (field, dofs, mask) in self._channels.items()}
+
+    def append(self, t, u, v, a):
+        """
+        Update the statistics with the state at time `t` and write the output grid
+        points passed since the previous step. `t` must be the time the step
+        actually reached, so the resampling stays exact when the step size adapts.
+        """
+        if self._last is not None and t <= self._last[0]:
+            raise ValueError(f"Probe times must increase, got {t} after {self._last[0]}.")
+        self.statistics.update(t, u, v, a)
+        samples = self._sample((u, v, a))
+        end = np.searchsorted(self.output_time, t, side="right")
+        if end > self._next:
+            grid = self.output_time[self._next:end]
+            if self._last is None:
+                weights = np.ones(len(grid))
+                previous = samples
+            else:
+                last_time, previous = self._last
+                weights = (grid - last_time) / (t - last_time)
+            for name, values in samples.items():
+                self.channels[name][:, self._next:end] = previous[name][:, None] \
+                    + weights[None, :] * (values - previous[name])[:, None]
+            self._next = end
+        self._last = (t, samples)
+        self.count += 1
+
+    def close(self, time, dt_hist, errors):
+        """
+        Trim the channels to the output grid points reached; no full histories are kept.
+        """
+        self.output_time = self.output_time[:self._next]
+        self.channels = {name: values[:, :self._next] for name, values in self.channels.items()}
+        return None, None, None
+
+def load_history(directory):
+    """
+    Reopen a stored history lazily: get memory-mapped (u, v, a) arrays of shape
+    (num_dof, steps), whose slices are read from disk on access, and the in-memory
+    (time, dt, errors) arrays.
+    """
+    with open(os.path.join(directory, "history.json")) as file:
+        steps = json.load(file)["steps"]
+    responses = tuple(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")[:, :steps] for name in FIELDS)
+    extras = tuple(np.load(os.path.join(directory, f"{name}.npy")) for name in ("time", "dt", "errors"))
+    return responses + extras
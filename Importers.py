@@ -0,0 +1,443 @@
+import numpy as np
+from Structure import Structure
+from Constraint import Constraint
+from Force import Force
+from Instrumentation import logger
+
+CHUNK_SIZE = 100000
+
+def _parse_block(lines, width=None):
+    """
+    Parse a block of comma or space separated numeric lines in one NumPy call.
+    Returns an (n_lines, width) array, or a flat array when `width` is None.
+    """
+    values = np.array(" ".join(lines).replace(",", " ").split(), dtype=float)
+    if width is None:
+        return values
+    if values.size != len(lines) * width:
+        raise ValueError(f"Expected {width} values on every line of the block starting with '{lines[0].strip()}'.")
+    return values.reshape(len(lines), width)
+
+def _line_width(line):
+    return len(line.replace(",", " ").split())
+
+class _LabelMap:
+    def __init__(self):
+        """
+        External node or element labels, collected chunk by chunk and mapped to
+        table indices with one sorted search instead of a per-label dict.
+        """
+        self.chunks = []
+        self._sorted = None
+
+    def add(self, labels):
+        self.chunks.append(np.asarray(labels, dtype=np.int64))
+        self._sorted = None
+
+    def lookup(self, labels, kind="node"):
+        """
+        Map external labels to table indices, raising on unknown labels.
+        """
+        if self._sorted is None:
+            all_labels = np.concatenate(self.chunks) if self.chunks else np.zeros(0, dtype=np.int64)
+            order = np.argsort(all_labels, kind="stable")
+            self._sorted = (all_labels[order], order)
+        sorted_labels, order = self._sorted
+        labels = np.asarray(labels, dtype=np.int64)
+        position = np.clip(np.searchsorted(sorted_labels, labels), 0, max(len(sorted_labels) - 1, 0))
+        if labels.size and (len(sorted_labels) == 0 or np.any(sorted_labels[position] != labels)):
+            missing = labels[(len(sorted_labels) == 0) | (sorted_labels[position] != labels)]
+            raise KeyError(f"Unknown {kind} labels {missing[:10].tolist()}.")
+        return order[position]
+
+def _constraint_mask(constraint):
+    return constraint.get_values() if isinstance(constraint, Constraint) else np.asarray(constraint, dtype=bool)
+
+def _force_vector(force):
+    return force.get_values() if isinstance(force, Force) else np.asarray(force, dtype=float)
+
+def _apply_sets(structure, node_sets, element_sets, constraints, forces, materials):
+    """
+    Apply user mappings of set names to Constraint, Force and (E, A, rho) values.
+    """
+    for name, constraint in (constraints or {}).items():
+        structure.set_constraints(node_sets[name], _constraint_mask(constraint))
+    for name, force in (forces or {}).items():
+        structure.set_forces(node_sets[name], _force_vector(force))
+    for name, (e_modulus, area, density) in (materials or {}).items():
+        structure.set_element_properties(element_sets[name], e_modulus, area, density)
+
+def _finish_elements(structure, nodes, element_chunks, default_material):
+    """
+    Map the collected element chunks to node indices and add them in one call.
+    Each chunk is (element labels, (n, 2) node labels, set names).
+    Returns the element label map and the element index ranges of every chunk.
+    """
+    elements = _LabelMap()
+    if not element_chunks:
+        return elements, []
+    labels = np.concatenate([chunk[0] for chunk in element_chunks])
+    connectivity = nodes.lookup(np.concatenate([chunk[1] for chunk in element_chunks]).ravel()).reshape(-1, 2)
+    elements.add(labels)
+    indices = structure.add_elements(connectivity, *default_material)
+    bounds = np.cumsum([0] + [len(chunk[0]) for chunk in element_chunks])
+    return elements, [indices[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+class InpReader:
+    # Abaqus truss element types with two nodes
+    truss_types = ("T3D2", "T2D2", "T3D2H", "T2D2H")
+
+    def __init__(self, default_material=(2.1e11, 1.0, 7850.0), chunk_size=CHUNK_SIZE):
+        """
+        Streaming reader for the truss subset of Abaqus .inp files: *NODE, *ELEMENT
+        (T3D2/T2D2), *NSET, *ELSET (with GENERATE), *MATERIAL with *ELASTIC and
+        *DENSITY, *SOLID SECTION (area on the data line), *BOUNDARY and *CLOAD.
+        Numeric blocks are parsed `chunk_size` lines at a time with NumPy and
+        appended straight to the structure tables.
+        """
+        self.default_material = default_material
+        self.chunk_size = chunk_size
+
+    def read(self, path, constraints=None, forces=None, materials=None):
+        """
+        Read a file into a new Structure. `constraints`, `forces` and `materials`
+        optionally map set names to Constraint, Force and (E, A, rho) values on top of
+        what the file defines. Returns (structure, node_sets, element_sets) with the
+        sets as arrays of node and element indices.
+        """
+        self.structure = Structure()
+        self.nodes = _LabelMap()
+        self.element_chunks = []
+        self.node_set_labels, self.element_set_labels = {}, {}
+        self.material_values, self.sections, self.boundaries, self.loads = {}, [], [], []
+        self.planar = False
+
+        keyword, parameters, block = None, {}, []
+        with open(path) as file:
+            for line in file:
+                if line.startswith("**") or not line.strip():
+                    continue
+                if line.startswith("*"):
+                    self._flush(keyword, parameters, block)
+                    keyword, parameters = self._keyword(line)
+                    if keyword == "MATERIAL":
+                        self.material = parameters["NAME"].upper()
+                    block = []
+                    continue
+                block.append(line)
+                if len(block) >= self.chunk_size:
+                    self._flush(keyword, parameters, block)
+                    block = []
+            self._flush(keyword, parameters, block)
+
+        return self._finish(constraints, forces, materials)
+
+    @staticmethod
+    def _keyword(line):
+        fields = [field.strip() for field in line[1:].split(",")]
+        parameters = {}
+        for field in fields[1:]:
+            key, _, value = field.partition("=")
+            parameters[key.strip().upper()] = value.strip()
+        return fields[0].upper(), parameters
+
+    def _flush(self, keyword, parameters, block):
+        if not block:
+            return
+        if keyword == "NODE":
+            values = _parse_block(block, _line_width(block[0]))
+            coordinates = np.zeros((len(values), 3))
+            coordinates[:, :values.shape[1] - 1] = values[:, 1:4]
+            self.nodes.add(values[:, 0])
+            self.structure.add_nodes(coordinates)
+            if "NSET" in parameters:
+                self.node_set_labels.setdefault(parameters["NSET"].upper(), []).append(values[:, 0].astype(np.int64))
+        elif keyword == "ELEMENT":
+            element_type = parameters.get("TYPE", "").upper()
+            if element_type not in self.truss_types:
+                logger.warning("Skipping %d elements of unsupported type %s", len(block), element_type)
+                return
+            self.planar |= element_type.startswith("T2D")
+            values = _parse_block(block, 3).astype(np.int64)
+            self.element_chunks.append((values[:, 0], values[:, 1:], parameters.get("ELSET", "").upper()))
+        elif keyword in ("NSET", "ELSET"):
+            labels = _parse_block(block).astype(np.int64)
+            if "GENERATE" in parameters:
+                labels = np.concatenate([np.arange(start, end + 1, step) for start, end, step in labels.reshape(-1, 3)])
+            target = self.node_set_labels if keyword == "NSET" else self.element_set_labels
+            target.setdefault(parameters[keyword].upper(), []).append(labels)
+        elif keyword in ("ELASTIC", "DENSITY"):
+            value = float(block[0].replace(",", " ").split()[0])
+            self.material_values.setdefault(self.material, {})[keyword] = value
+        elif keyword == "SOLID SECTION":
+            area = float(block[0].replace(",", " ").split()[0])
+            self.sections.append((parameters["ELSET"].upper(), parameters["MATERIAL"].upper(), area))
+        elif keyword in ("BOUNDARY", "CLOAD"):
+            # Few lines, referring to node labels or set names
+            target = self.boundaries if keyword == "BOUNDARY" else self.loads
+            target += [[field.strip() for field in line.split(",") if field.strip()] for line in block]
+        else:
+            logger.debug("Skipping keyword *%s", keyword)
+
+    def _nodes_of(self, reference, node_sets):
+        if reference.upper() in node_sets:
+            return node_sets[reference.upper()]
+        return self.nodes.lookup([int(reference)])
+
+    def _finish(self, constraints, forces, materials):
+        structure = self.structure
+        elements, chunk_indices = _finish_elements(structure, self.nodes, self.element_chunks, self.default_material)
+
+        node_sets = {name: self.nodes.lookup(np.concatenate(chunks))
+                     for name, chunks in self.node_set_labels.items()}
+        element_sets = {name: elements.lookup(np.concatenate(chunks), "element")
+                        for name, chunks in self.element_set_labels.items()}
+        for (_, _, name), indices in zip(self.element_chunks, chunk_indices):
+            if name:
+                element_sets[name] = np.concatenate([element_sets.get(name, np.zeros(0, dtype=np.int64)), indices])
+
+        if self.planar:
+            structure.set_constraints(np.arange(len(structure.nodes)), [False, False, True])
+        for elset, material, area in self.sections:
+            values = self.material_values.get(material, {})
+            e_modulus = values.get("ELASTIC", self.default_material[0])
+            density = values.get("DENSITY", self.default_material[2])
+            structure.set_element_properties(element_sets[elset], e_modulus, area, density)
+
+        for fields in self.boundaries:
+            nodes = self._nodes_of(fields[0], node_sets)
+            mask = structure.constraint_mask[nodes].copy()
+            kind = fields[1].upper()
+            if kind in ("ENCASTRE", "PINNED"):
+                mask[:] = True
+            else:
+                first = int(fields[1])
+                last = int(fields[2]) if len(fields) > 2 else first
+                if len(fields) > 3 and float(fields[3]) != 0.0:
+                    raise ValueError("Prescribed non-zero displacements are not supported.")
+                mask[:, first - 1:min(last, 3)] = True
+            structure.set_constraints(nodes, mask)
+        for fields in self.loads:
+            nodes = self._nodes_of(fields[0], node_sets)
+            loads = structure.nodal_loads[nodes].copy()
+            loads[:, int(fields[1]) - 1] = float(fields[2])
+            structure.set_forces(nodes, loads)
+
+        _apply_sets(structure, node_sets, element_sets, constraints, forces, materials)
+        logger.info("Imported %d nodes and %d elements", len(structure.nodes), len(structure.elements))
+        return structure, node_sets, element_sets
+
+def read_inp(path, constraints=None, forces=None, materials=None, default_material=(2.1e11, 1.0, 7850.0),
+             chunk_size=CHUNK_SIZE):
+    """
+    Read the truss part of an Abaqus .inp file, see InpReader.
+    """
+    return InpReader(default_material, chunk_size).read(path, constraints, forces, materials)
+
+# Nodes per element of the common Gmsh element types
+GMSH_NODES_PER_ELEMENT = {1: 2, 2: 3, 3: 4, 4: 4, 5: 8, 6: 6, 7: 5, 8: 3, 9: 6, 15: 1}
+# Dimension of the Gmsh element types: points, lines, surfaces and volumes up to order 5
+GMSH_DIMENSIONS = {15: 0, 1: 1, 8: 1, 26: 1, 27: 1, 28: 1,
+                   2: 2, 3: 2, 9: 2, 10: 2, 16: 2, 20: 2, 21: 2, 22: 2, 23: 2, 24: 2, 25: 2,
+                   4: 3, 5: 3, 6: 3, 7: 3, 11: 3, 12: 3, 13: 3, 14: 3, 17: 3, 18: 3, 19: 3, 29: 3, 30: 3, 31: 3}
+GMSH_LINE = 1
+
+class MshReader:
+    def __init__(self, default_material=(2.1e11, 1.0, 7850.0), chunk_size=CHUNK_SIZE):
+        """
+        Streaming reader for ASCII Gmsh .msh files, format 2.2 and 4.1. Two-node line
+        elements become truss elements. Every physical group becomes a node set (the
+        nodes of all its elements, points included) and an element set (its lines).
+        """
+        self.default_material = default_material
+        self.chunk_size = chunk_size
+
+    def read(self, path, constraints=None, forces=None, materials=None, planar=False):
+        """
+        Read a file into a new Structure. `constraints`, `forces` and `materials` map
+        physical group names to Constraint, Force and (E, A, rho) values; `planar` fixes
+        the z DOFs of all nodes for 2D meshes. Returns (structure, node_sets, element_sets).
+        """
+        self.structure = Structure()
+        self.nodes = _LabelMap()
+        self.element_chunks = []
+        self.group_names = {}
+        self.entity_groups = {}
+        # Node labels and line element chunk numbers per physical tag
+        self.group_nodes, self.group_lines = {}, {}
+
+        with open(path) as file:
+            for line in file:
+                section = line.strip()
+                if section == "$MeshFormat":
+                    self.version = float(next(file).split()[0])
+                elif section == "$PhysicalNames":
+                    for _ in range(int(next(file))):
+                        dim, tag, name = next(file).split(maxsplit=2)
+                        self.group_names[(int(dim), int(tag))] = name.strip().strip('"')
+                elif section == "$Entities":
+                    self._read_entities(file)
+                elif section == "$Nodes":
+                    self._read_nodes(file)
+                elif section == "$Elements":
+                    self._read_elements(file)
+
+        structure = self.structure
+        elements, chunk_indices = _finish_elements(structure, self.nodes, self.element_chunks, self.default_material)
+        node_sets, element_sets = {}, {}
+        for group, labels in self.group_nodes.items():
+            name = self.group_names.get(group, str(group[1]))
+            node_sets[name] = np.unique(self.nodes.lookup(np.concatenate(labels)))
+            chunks = self.group_lines.get(group, [])
+            element_sets[name] = (np.concatenate([chunk_indices[chunk] for chunk in chunks])
+                                  if chunks else np.zeros(0, dtype=np.int64))
+
+        if planar:
+            structure.set_constraints(np.arange(len(structure.nodes)), [False, False, True])
+        _apply_sets(structure, node_sets, element_sets, constraints, forces, materials)
+        logger.info("Imported %d nodes and %d elements", len(structure.nodes), len(structure.elements))
+        return structure, node_sets, element_sets
+
+    def _chunks(self, file, count):
+        """
+        Yield the next `count` lines of `file` in lists of at most `chunk_size` lines.
+        """
+        while count > 0:
+            size = min(count, self.chunk_size)
+            yield [next(file) for _ in range(size)]
+            count -= size
+
+    def _read_entities(self, file):
+        # Physical tags of points, curves, surfaces and volumes (format 4.1)
+        counts = [int(value) for value in next(file).split()]
+        for dim, count in enumerate(counts):
+            for _ in range(count):
+                values = next(file).split()
+                tag = int(values[0])
+                # Points list x y z, other entities a bounding box, before the physical tags
+                offset = 4 if dim == 0 else 7
+                n_physical = int(values[offset])
+                self.entity_groups[(dim, tag)] = [(dim, abs(int(value)))
+                                                  for value in values[offset + 1:offset + 1 + n_physical]]
+
+    def _read_nodes(self, file):
+        if self.version < 4:
+            for block in self._chunks(file, int(next(file))):
+                values = _parse_block(block, 4)
+                self.nodes.add(values[:, 0])
+                self.structure.add_nodes(values[:, 1:])
+            return
+        n_blocks = int(next(file).split()[0])
+        for _ in range(n_blocks):
+            _, _, parametric, count = (int(value) for value in next(file).split())
+            # All node tags of the block come first, then their coordinates
+            for block in self._chunks(file, count):
+                self.nodes.add(_parse_block(block))
+            for block in self._chunks(file, count):
+                values = _parse_block(block, _line_width(block[0]))
+                self.structure.add_nodes(values[:, :3])
+
+    def _add_elements(self, element_type, values, groups):
+        """
+        Record one chunk of elements of one type: lines become truss elements and
+        the nodes of every element join the node sets of its physical groups.
+        """
+        node_labels = values[:, 1:]
+        for group in groups:
+            self.group_nodes.setdefault(group, []).append(node_labels.ravel())
+        if element_type == GMSH_LINE:
+            for group in groups:
+                self.group_lines.setdefault(group, []).append(len(self.element_chunks))
+            self.element_chunks.append((values[:, 0], node_labels, ""))
+
+    def _read_elements(self, file):
+        if self.version < 4:
+            for block in self._chunks(file, int(next(file))):
+                self._read_elements_22(block)
+            return
+        n_blocks = int(next(file).split()[0])
+        for _ in range(n_blocks):
+            dim, tag, element_type, count = (int(value) for value in next(file).split())
+            groups = self.entity_groups.get((dim, tag), [])
+            for block in self._chunks(file, count):
+                values = _parse_block(block, _line_width(block[0])).astype(np.int64)
+                self._add_elements(element_type, values, groups)
+
+    def _read_elements_22(self, block):
+        # Lines are "tag type n_tags tags... nodes..."; group lines of equal width, then by type and physical tag
+        widths = np.array([_line_width(line) for line in block])
+        for width in np.unique(widths):
+            lines = [line for line, line_width in zip(block, widths) if line_width == width]
+            values = _parse_block(lines, width).astype(np.int64)
+            n_tags = values[0, 2]
+            # The first tag is the physical group, 0 when the element has none
+            physicals = values[:, 3] if n_tags else np.zeros(len(values), dtype=np.int64)
+            for element_type, physical in np.unique(np.c_[values[:, 1], physicals], axis=0):
+                rows = values[(values[:, 1] == element_type) & (physicals == physical)]
+                nodes_per_element = GMSH_NODES_PER_ELEMENT.get(int(element_type), width - 3 - n_tags)
+                # Unknown types keep their numeric physical tag as the set name
+                dim = GMSH_DIMENSIONS.get(int(element_type))
+                groups = [(dim, int(physical))] if physical else []
+                self._add_elements(int(element_type), np.c_[rows[:, 0], rows[:, 3 + n_tags:3 + n_tags + nodes_per_element]],
+                                   groups)
+
+def read_msh(path, constraints=None, forces=None, materials=None, planar=False,
+             default_material=(2.1e11, 1.0, 7850.0), chunk_size=CHUNK_SIZE):
+    """
+    Read the line elements of an ASCII Gmsh .msh file, see MshReader.
+    """
+    return MshReader(default_material, chunk_size).read(path, constraints, forces, materials, planar)
+
+def _read_table(path, chunk_size):
+    """
+    Stream a numeric CSV file in chunks, skipping a header line. Yields (n, width) arrays.
+    """
+    with open(path) as file:
+        block = []
+        for line in file:
+            if not line.strip() or line.startswith("#"):
+                continue
+            if not block and line.lstrip()[0] not in "+-.0123456789":
+                continue
+            block.append(line)
+            if len(block) >= chunk_size:
+                yield _parse_block(block, _line_width(block[0]))
+                block = []
+        if block:
+            yield _parse_block(block, _line_width(block[0]))
+
+def read_csv(nodes_path, elements_path, default_material=(2.1e11, 1.0, 7850.0), planar=False,
+             chunk_size=CHUNK_SIZE):
+    """
+    Read a truss from two CSV files, an optional header line each:
+    nodes "id, x, y, z[, fix_x, fix_y, fix_z[, fx, fy, fz]]" with fix flags 0/1 and
+    elements "id, node1, node2[, E, A, rho]", missing values taken from `default_material`.
+    Returns the structure and the node and element label arrays in table order.
+    """
+    structure = Structure()
+    nodes = _LabelMap()
+    for values in _read_table(nodes_path, chunk_size):
+        if values.shape[1] not in (4, 7, 10):
+            raise ValueError("Node rows need 4, 7 or 10 columns: id, x, y, z, fix flags, forces.")
+        indices = structure.add_nodes(values[:, 1:4])
+        nodes.add(values[:, 0])
+        if values.shape[1] >= 7 or planar:
+            fixed = values[:, 4:7] != 0 if values.shape[1] >= 7 else np.zeros((len(indices), 3), dtype=bool)
+            # Planar models also fix z, on top of the supports read from the file
+            fixed[:, 2] |= planar
+            structure.set_constraints(indices, fixed)
+        if values.shape[1] == 10:
+            structure.set_forces(indices, values[:, 7:10])
+
+    element_labels = []
+    for values in _read_table(elements_path, chunk_size):
+        if values.shape[1] not in (3, 6):
+            raise ValueError("Element rows need 3 or 6 columns: id, node1, node2, E, A, rho.")
+        connectivity = nodes.lookup(values[:, 1:3].astype(np.int64).ravel()).reshape(-1, 2)
+        properties = values[:, 3:6].T if values.shape[1] == 6 else default_material
+        structure.add_elements(connectivity, *properties)
+        element_labels.append(values[:, 0].astype(np.int64))
+
+    node_labels = np.concatenate(nodes.chunks) if nodes.chunks else np.zeros(0, dtype=np.int64)
+    element_labels = np.concatenate(element_labels) if element_labels else np.zeros(0, dtype=np.int64)
+    return structure, node_labels, element_labels
@@ -0,0 +1,85 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from Node import Node
+
+class InfluenceLine:
+    def __init__(self, matrix, deck_nodes, stations, direction):
+        """
+        Influence lines of member axial forces for a unit load moving over the deck.
+        `matrix` is (n_members, n_positions): entry (e, k) is the axial force of
+        member e with the unit load at deck node k.
+        """
+        self.matrix = matrix
+        self.deck_nodes = deck_nodes
+        self.stations = stations
+        self.direction = direction
+
+    def __str__(self):
+        return f"InfluenceLine for {self.matrix.shape[0]} members over {self.matrix.shape[1]} load positions."
+
+    def member(self, element_index):
+        """
+        Get the influence line (one value per load position) of one member.
+        """
+        return self.matrix[element_index]
+
+    def at(self, element_index, station):
+        """
+        Axial force of a member for a unit load at any station along the deck,
+        interpolated linearly between deck nodes.
+        """
+        return np.interp(station, self.stations, self.matrix[element_index])
+
+    def extremes(self, element_index):
+        """
+        Get (max value, station of max, min value, station of min) of one member.
+        """
+        line = self.matrix[element_index]
+        i_max, i_min = int(line.argmax()), int(line.argmin())
+        return line[i_max], self.stations[i_max], line[i_min], self.stations[i_min]
+
+    def plot(self, element_indices=None, ax=None):
+        """
+        Plot the influence lines of the given members (all members by default).
+        """
+        if element_indices is None:
+            element_indices = range(self.matrix.shape[0])
+        if ax is None:
+            plt.figure(figsize=(12, 6))
+            ax = plt.gca()
+
+        for element_index in element_indices:
+            ax.plot(self.stations, self.matrix[element_index], marker="o", label=f"Member {element_index}")
+        ax.axhline(0.0, color="black", linewidth=0.8)
+        ax.set_title("Axial Force Influence Lines")
+        ax.set_xlabel("Load position along deck [m]")
+        ax.set_ylabel("Axial force per unit load")
+        ax.grid()
+        ax.legend(loc="upper right")
+        return ax
+
+def influence_lines(structure, deck_nodes, direction=(0.0, -1.0, 0.0)):
+    """
+    Solve all unit load positions along the deck as one multi-RHS solve.
+    `deck_nodes` are node indices or Node objects of the structure in deck order;
+    `direction` is the load direction, normalized to a unit load.
+    """
+    deck_nodes = np.array([node.index if isinstance(node, Node) else node for node in deck_nodes], dtype=np.int64)
+    if deck_nodes.size == 0:
+        raise ValueError("At least one deck node is required.")
+    direction = np.asarray(direction, dtype=float)
+    if np.linalg.norm(direction) == 0:
+        raise ValueError("Load direction must be non-zero.")
+    direction = direction / np.linalg.norm(direction)
+
+    # One column per load position, a unit load at the deck node in that column
+    n_positions = len(deck_nodes)
+    loads = np.zeros((len(structure.nodes), 3, n_positions))
+    loads[deck_nodes, :, np.arange(n_positions)] = direction
+    results = structure.solve_load_cases(loads)
+
+    # Stations: cumulative distance along the deck node sequence
+    deck_coordinates = structure.coordinates[deck_nodes]
+    segments = np.linalg.norm(np.diff(deck_coordinates, axis=0), axis=1)
+    stations = np.concatenate([[0.0], np.cumsum(segments)])
+    return InfluenceLine(results.axial_forces, deck_nodes, stations, direction)
@@ -0,0 +1,237 @@
+import functools
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import scipy.sparse as sp
+
+# Package logger, silent until a level is set with set_log_level
+logger = logging.getLogger("truss")
+logger.addHandler(logging.NullHandler())
+logger.setLevel(logging.WARNING)
+
+PHASES = ("enumerate", "element_kernels", "assembly", "bc_reduction", "factorization", "solve", "recovery")
+
+def set_log_level(level):
+    """
+    Set the verbosity of the solver messages, e.g. "INFO" for progress messages or
+    "DEBUG" for matrices and vectors. A stream handler is attached on first use.
+    """
+    if isinstance(level, str):
+        level = level.upper()
+    logger.setLevel(level)
+    if not any(isinstance(handler, logging.StreamHandler) for handler in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+
+class PhaseTimer:
+    def __init__(self):
+        """
+        Accumulated wall time and call count per analysis phase.
+        Nested phases are exclusive: time spent in an inner phase is not
+        counted again in the phase that encloses it.
+        """
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self._stack = []
+
+    def __str__(self):
+        return ", ".join(f"{name} {seconds:.4f} s" for name, seconds in self.seconds.items())
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the enclosed block as `name`.
+        """
+        now = time.perf_counter()
+        if self._stack:
+            # Pause the enclosing phase
+            outer, started = self._stack[-1]
+            self.seconds[outer] += now - started
+        self._stack.append((name, now))
+        try:
+            with profiled(name):
+                yield
+        finally:
+            now = time.perf_counter()
+            name, started = self._stack.pop()
+            self.seconds[name] = self.seconds.get(name, 0.0) + now - started
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if self._stack:
+                # Resume the enclosing phase
+                self._stack[-1] = (self._stack[-1][0], now)
+
+    def report(self):
+        """
+        Get {phase: {"seconds": ..., "calls": ...}} plus the total time.
+        """
+        report = {name: {"seconds": self.seconds[name], "calls": self.calls[name]} for name in self.seconds}
+        report["total"] = {"seconds": sum(self.seconds.values()), "calls": sum(self.calls.values())}
+        return report
+
+    def reset(self):
+        """
+        Clear all accumulated timings.
+        """
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self._stack = []
+
+# Profile collecting data, None while profiling is off
+_active = None
+
+class Profile:
+    def __init__(self, trace_memory=True):
+        """
+        Opt-in profiling context: `with Profile() as profile: ...`.
+        While active it records per phase the call count, inclusive wall time and peak
+        allocated bytes above the memory in use when the phase started (Python and NumPy
+        allocations traced by tracemalloc, not the SuperLU factor), the size and fill of
+        the operators in use, and the call counts of the element kernels.
+        """
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.matrices = {}
+        self.kernel_calls = {}
+        self.seconds = 0.0
+        self.peak_bytes = 0
+        self._stack = []
+        self._started_tracing = False
+
+    def __str__(self):
+        return f"Profile with {len(self.phases)} phases, {self.seconds:.4f} s and peak {self.peak_bytes} bytes."
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("A profile is already active.")
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _active = self
+        self._enter("total")
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        total = self._exit()
+        self.seconds, self.peak_bytes = total["seconds"], total["peak_bytes"]
+        del self.phases["total"]
+        _active = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def _enter(self, name):
+        current = 0
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # Keep the peak reached so far by the enclosing phase
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+            tracemalloc.reset_peak()
+        self._stack.append([name, time.perf_counter(), current, current])
+
+    def _exit(self):
+        name, started, base, peak = self._stack.pop()
+        seconds = time.perf_counter() - started
+        if self.trace_memory:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+
+        entry = self.phases.setdefault(name, {"calls": 0, "seconds": 0.0, "peak_bytes": 0})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        entry["peak_bytes"] = max(entry["peak_bytes"], peak - base)
+        return {"seconds": seconds, "peak_bytes": peak - base}
+
+    def count(self, kernel, items):
+        entry = self.kernel_calls.setdefault(kernel, {"calls": 0, "items": 0})
+        entry["calls"] += 1
+        entry["items"] += int(items)
+
+    def record(self, name, matrix):
+        """
+        Store shape, nonzeros, fill ratio and storage bytes of a sparse or dense matrix.
+        """
+        rows, cols = matrix.shape
+        if sp.issparse(matrix):
+            matrix = matrix.tocsr()
+            nnz = matrix.nnz
+            nbytes = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+            storage = "sparse"
+        else:
+            matrix = np.asarray(matrix)
+            nnz = int(np.count_nonzero(matrix))
+            nbytes = matrix.nbytes
+            storage = "dense"
+        self.matrices[name] = {
+            "storage": storage, "shape": [rows, cols], "nnz": int(nnz),
+            "fill": nnz / (rows * cols) if rows * cols else 0.0, "bytes": int(nbytes),
+        }
+
+    def report(self):
+        """
+        Get the profile as a JSON-serializable dict.
+        """
+        return {
+            "seconds": self.seconds, "peak_bytes": self.peak_bytes,
+            "phases": self.phases, "matrices": self.matrices, "kernel_calls": self.kernel_calls,
+        }
+
+    def to_json(self, path=None):
+        """
+        Serialize the report, and write it to `path` when given.
+        """
+        text = json.dumps(self.report(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
+
+@contextmanager
+def profiled(name):
+    """
+    Record the enclosed block as phase `name` of the active profile, no-op otherwise.
+    """
+    profile = _active
+    if profile is None:
+        yield
+        return
+    profile._enter(name)
+    try:
+        yield
+    finally:
+        profile._exit()
+
+def profile_phase(name):
+    """
+    Decorator recording every call of a function as phase `name` of the active profile.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with profiled(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def count_kernel(kernel, items):
+    """
+    Count one call of an element kernel over `items` elements in the active profile.
+    """
+    if _active is not None:
+        _active.count(kernel, items)
+
+def record_matrix(name, matrix):
+    """
+    Record operator statistics in the active profile, no-op otherwise.
+    """
+    if _active is not None:
+        _active.record(name, matrix)
@@ -0,0 +1,96 @@
+import numpy as np
+from Instrumentation import count_kernel
+
+def element_geometry(coordinates, connectivity):
+    """
+    Compute the length (n_elem,) and unit direction vector (n_elem, 3)
+    of every element at once.
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    connectivity = np.asarray(connectivity, dtype=np.int64).reshape(-1, 2)
+
+    # Element direction vectors
+    L_vec = coordinates[connectivity[:, 1]] - coordinates[connectivity[:, 0]]
+    L = np.sqrt(np.einsum("ij,ij->i", L_vec, L_vec))
+
+    if np.any(L == 0):
+        overlapping = np.flatnonzero(L == 0)
+        raise ValueError(f"Element length is zero — nodes are overlapping (elements {overlapping.tolist()}).")
+
+    return L, L_vec / L[:, None]
+
+def _block_stack(outer, diagonal, off_diagonal):
+    """
+    Build the (n_elem, 6, 6) stack [[d*O, o*O], [o*O, d*O]] from the
+    (n_elem, 3, 3) outer products O and per-element factors d and o.
+    """
+    blocks = np.empty((len(outer), 6, 6))
+    blocks[:, :3, :3] = diagonal[:, None, None] * outer
+    blocks[:, 3:, 3:] = blocks[:, :3, :3]
+    blocks[:, :3, 3:] = off_diagonal[:, None, None] * outer
+    blocks[:, 3:, :3] = blocks[:, :3, 3:]
+    return blocks
+
+def stiffness_blocks(coordinates, connectivity, e_modulus, area):
+    """
+    Compute the 6x6 stiffness matrices of all truss elements in dyadic form.
+    Material arrays may be scalars or one value per element.
+    """
+    L, direction = element_geometry(coordinates, connectivity)
+    count_kernel("stiffness_blocks", len(direction))
+    outer = direction[:, :, None] * direction[:, None, :]
+
+    # Scale factor EA/L, block form [ K -K ; -K K ]
+    scale = np.broadcast_to(np.asarray(e_modulus, dtype=float) * np.asarray(area, dtype=float) / L, L.shape)
+    return _block_stack(outer, scale, -scale)
+
+def mass_blocks(coordinates, connectivity, density, area):
+    """
+    Compute the 6x6 consistent mass matrices T^T m T of all truss elements.
+    """
+    L, direction = element_geometry(coordinates, connectivity)
+    count_kernel("mass_blocks", len(direction))
+    outer = direction[:, :, None] * direction[:, None, :]
+
+    # Scale factor of the linear element, m = scale * [ 2 1 ; 1 2 ]
+    scale = np.broadcast_to(L * np.asarray(density, dtype=float) * np.asarray(area, dtype=float) / 6, L.shape)
+    return _block_stack(outer, 2 * scale, scale)
+
+def transformation_matrices(coordinates, connectivity):
+    """
+    Compute the (n_elem, 2, 6) stack of truss transformation matrices.
+    """
+    _, direction = element_geometry(coordinates, connectivity)
+    count_kernel("transformation_matrices", len(direction))
+    T = np.zeros((len(direction), 2, 6))
+    T[:, 0, :3] = direction
+    T[:, 1, 3:] = direction
+    return T
+
+def gather_element_displacements(dof_maps, U_global):
+    """
+    Pick the 6 global displacements of every element, using zero for constrained DOFs.
+    `U_global` may hold several columns (one per load case or time step).
+    """
+    dof_maps = np.asarray(dof_maps, dtype=np.int64)
+    U = np.asarray(U_global, dtype=float)
+    if U.ndim == 2 and U.shape[1] == 1:
+        U = U[:, 0]
+
+    # Append one zero row that every constrained DOF (-1) points to
+    padded = np.concatenate([U, np.zeros((1,) + U.shape[1:])])
+    return padded[np.where(dof_maps == -1, len(U), dof_maps)]
+
+def axial_forces(coordinates, connectivity, e_modulus, area, dof_maps, U_global):
+    """
+    Compute the axial force EA/L * (u2 - u1) . n of all elements.
+    Returns (n_elem,) for a single displacement vector or (n_elem, n_cols) otherwise.
+    """
+    L, direction = element_geometry(coordinates, connectivity)
+    count_kernel("axial_forces", len(direction))
+    u = gather_element_displacements(dof_maps, U_global)
+
+    # Elongation projected onto the element axis
+    elongation = np.einsum("ij,ij...->i...", direction, u[:, 3:] - u[:, :3])
+    scale = np.asarray(e_modulus, dtype=float) * np.asarray(area, dtype=float) / L
+    return scale.reshape((-1,) + (1,) * (elongation.ndim - 1)) * elongation
@@ -0,0 +1,45 @@
+import numpy as np
+import Kernels
+
+class LoadCaseResults:
+    def __init__(self, dof_map, displacements, axial_forces, names=None):
+        """
+        Compact results of several static load cases solved together.
+        `displacements` is (num_dof, n_cases) over the free DOFs only and
+        `axial_forces` is (n_elem, n_cases); nothing is written into the nodes.
+        """
+        self.dof_map = np.array(dof_map, dtype=np.int64)
+        self.displacements = displacements
+        self.axial_forces = axial_forces
+        self.num_cases = displacements.shape[1]
+        if names is None:
+            names = [f"LC{i + 1}" for i in range(self.num_cases)]
+        if len(names) != self.num_cases:
+            raise ValueError(f"Expected {self.num_cases} load case names, got {len(names)}.")
+        self.names = list(names)
+
+    def __str__(self):
+        return f"LoadCaseResults with {self.num_cases} cases, {self.displacements.shape[0]} DOFs and {self.axial_forces.shape[0]} elements."
+
+    def case_index(self, case):
+        """
+        Get the column of a load case given its index or name.
+        """
+        if isinstance(case, str):
+            return self.names.index(case)
+        if not -self.num_cases <= case < self.num_cases:
+            raise IndexError("Load case index out of range.")
+        return case % self.num_cases
+
+    def nodal_displacements(self, case):
+        """
+        Get the (n_nodes, 3) displacements of one load case, zero for constrained DOFs.
+        """
+        column = self.displacements[:, self.case_index(case)]
+        return Kernels.gather_element_displacements(self.dof_map, column)
+
+    def element_forces(self, case):
+        """
+        Get the (n_elem,) axial forces of one load case.
+        """
+        return self.axial_forces[:, self.case_index(case)]
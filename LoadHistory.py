@@ -0,0 +1,132 @@
+import numpy as np
+import scipy.sparse as sp
+from Force import Force
+
+class LoadHistory:
+    def __init__(self):
+        """
+        Time-dependent nodal loads R(t) = P @ g(t): every term pairs a spatial load
+        pattern (nodal forces, a column of the sparse (num_dof, n_terms) matrix P)
+        with a time function, the entry of g(t). Time functions are constants,
+        harmonics, tabulated signals or callables; each kind is evaluated for all of
+        its terms at once, so a step costs a few small vector operations and one
+        sparse product over the loaded DOFs, whatever the length of the records.
+        """
+        self._patterns = []
+        self._constants = []
+        self._harmonics = []
+        self._tables = []
+        self._functions = []
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def _add_pattern(self, nodes, forces):
+        if isinstance(forces, Force):
+            forces = forces.get_values()
+        nodes = np.atleast_1d(np.asarray(nodes, dtype=np.int64))
+        forces = np.broadcast_to(np.asarray(forces, dtype=float), (len(nodes), 3))
+        self._patterns.append((nodes, forces.copy()))
+        return len(self._patterns) - 1
+
+    def add_constant(self, nodes, forces):
+        """
+        Constant loads `forces` ((3,) or one (3,) row per node) on `nodes`,
+        applied suddenly at the start of the run.
+        """
+        self._constants.append(self._add_pattern(nodes, forces))
+        return self
+
+    def add_harmonic(self, nodes, forces, frequency, phase=0.0):
+        """
+        Harmonic loads forces * sin(2 pi frequency t + phase), `frequency` in Hz.
+        """
+        self._harmonics.append((self._add_pattern(nodes, forces), 2 * np.pi * frequency, phase))
+        return self
+
+    def add_function(self, nodes, forces, function):
+        """
+        Loads forces * function(t) for a scalar analytic function of time.
+        """
+        if not callable(function):
+            raise ValueError("The load time function must be callable.")
+        self._functions.append((self._add_pattern(nodes, forces), function))
+        return self
+
+    def add_table(self, nodes, forces, times, values):
+        """
+        Tabulated loads forces * s(t), linearly interpolated in the sampled signal
+        `values` at increasing `times` and held at the first/last value outside.
+        `values` is one (n_times,) signal shared by all nodes, or (n_times, n_nodes)
+        with a separate signal per node.
+        """
+        nodes = np.atleast_1d(np.asarray(nodes, dtype=np.int64))
+        times = np.asarray(times, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if times.ndim != 1 or times.size == 0 or np.any(np.diff(times) <= 0):
+            raise ValueError("Table times must be a non-empty, strictly increasing 1D array.")
+        if values.shape[0] != len(times):
+            raise ValueError(f"Expected {len(times)} table values, got {values.shape[0]}.")
+        if isinstance(forces, Force):
+            forces = forces.get_values()
+        forces = np.broadcast_to(np.asarray(forces, dtype=float), (len(nodes), 3))
+
+        if values.ndim == 1:
+            columns = [self._add_pattern(nodes, forces)]
+            values = values[:, None]
+        elif values.shape[1:] == (len(nodes),):
+            # One term per node, each with its own signal
+            columns = [self._add_pattern(node, force) for node, force in zip(nodes, forces)]
+        else:
+            raise ValueError(f"Table values must have shape ({len(times)},) or ({len(times)}, {len(nodes)}).")
+        self._tables.append((np.array(columns, dtype=np.int64), times, values))
+        return self
+
+    def pattern(self, dof_map, num_dof):
+        """
+        Sparse (num_dof, n_terms) CSR matrix of the spatial patterns for the given
+        DOF numbering; loads on constrained DOFs are dropped.
+        """
+        dof_map = np.asarray(dof_map, dtype=np.int64)
+        rows, columns, data = [], [], []
+        for column, (nodes, forces) in enumerate(self._patterns):
+            if np.any((nodes < 0) | (nodes >= len(dof_map))):
+                raise IndexError(f"Load history term {column} acts on a node outside 0..{len(dof_map) - 1}.")
+            dofs = dof_map[nodes].ravel()
+            free = dofs >= 0
+            rows.append(dofs[free])
+            columns.append(np.full(np.count_nonzero(free), column))
+            data.append(forces.ravel()[free])
+        if not rows:
+            return sp.csr_matrix((num_dof, 0))
+        # Duplicate entries (same node in one term twice) are summed
+        return sp.csr_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(columns))),
+                             shape=(num_dof, len(self._patterns)))
+
+    def factors(self, t):
+        """
+        Values g(t) of all time functions, one per term.
+        """
+        g = np.zeros(len(self._patterns))
+        g[self._constants] = 1.0
+        if self._harmonics:
+            columns, omega, phase = (np.array(values) for values in zip(*self._harmonics))
+            g[columns] = np.sin(omega * t + phase)
+        for columns, times, values in self._tables:
+            if len(times) == 1 or t <= times[0]:
+                g[columns] = values[0]
+            elif t >= times[-1]:
+                g[columns] = values[-1]
+            else:
+                k = np.searchsorted(times, t, side="right") - 1
+                weight = (t - times[k]) / (times[k + 1] - times[k])
+                g[columns] = (1 - weight) * values[k] + weight * values[k + 1]
+        for column, function in self._functions:
+            g[column] = function(t)
+        return g
+
+    def evaluate(self, pattern, t):
+        """
+        Load vector R(t) = pattern @ g(t) with a pattern from `pattern()`.
+        """
+        return pattern @ self.factors(t)
@@ -1,5 +1,7 @@
 from Constraint import Constraint
 from Force import Force
+from Tables import NodeTable, read_only
+from Instrumentation import logger
 import numpy as np
 
 class Node():
@@ -7,23 +9,82 @@ class Node():
         """
         Initialize a Node object with a degree of freedom
         """
-        # Set default values for position, displacement, constraint, force, and dof_number
-        self.position = [x1, x2, x3]
-        self.displacement = [0, 0, 0]
-        self.constraint = Constraint(False, False, False)
-        self.force = Force(0, 0, 0)
-        self.dof_number = [-1, -1, -1]
+        # A standalone node owns a one-row table until a structure adopts it.
+        # Position, displacement, constraint, force and dof_number all live in that table.
+        self._table = NodeTable(capacity=1)
+        self._index = self._table.append([x1, x2, x3])
         # Print the node's coordinates
         #self.print()
+
+    @classmethod
+    def view(cls, table, index):
+        """
+        Create a thin Node view over row `index` of a NodeTable.
+        """
+        node = cls.__new__(cls)
+        node._table = table
+        node._index = int(index)
+        return node
+
+    def _move_to(self, table):
+        """
+        Copy this node's row into `table` and turn the node into a view over it.
+        """
+        old_table, old_index = self._table, self._index
+        index = table.append(old_table.coordinates[old_index])
+        table.constraint_mask[index] = old_table.constraint_mask[old_index]
+        table.nodal_loads[index] = old_table.nodal_loads[old_index]
+        table.displacements[index] = old_table.displacements[old_index]
+        self._table, self._index = table, int(index)
+        return self._index
   
     def __str__(self):
         return f"[{self.position[0]}, {self.position[1]}, {self.position[2]}]"
     
     def __hash__(self):
-        return hash(tuple(self.position))
+        return hash((id(self._table), self._index))
 
     def __eq__(self, other):
-        return isinstance(other, Node) and self.position == other.position
+        # Identity is the table row, not the position: coincident nodes stay distinct.
+        # Use Structure.find_node or merge_coincident_nodes for geometric matching.
+        return isinstance(other, Node) and self._table is other._table and self._index == other._index
+
+    @property
+    def index(self):
+        """
+        Row of this node in its table.
+        """
+        return self._index
+
+    @property
+    def position(self):
+        # Read-only so that geometry changes always go through the setter
+        return read_only(self._table.coordinates[self._index])
+
+    @position.setter
+    def position(self, position):
+        self._table.coordinates[self._index] = position
+        self._table.modified("coordinates", rows=[self._index])
+
+    @property
+    def displacement(self):
+        return self._table.displacements[self._index]
+
+    @displacement.setter
+    def displacement(self, displacement):
+        self._table.displacements[self._index] = displacement
+
+    @property
+    def dof_number(self):
+        return self._table.dof_map[self._index]
+
+    @property
+    def constraint(self):
+        return Constraint(*self._table.constraint_mask[self._index].tolist())
+
+    @property
+    def force(self):
+        return Force(*self._table.nodal_loads[self._index].tolist())
     
     def set_force(self, force: Force):
         """
@@ -31,14 +92,15 @@ class Node():
         """
         if not isinstance(force, Force):
             raise TypeError("Expected a Force object.")
-        self.force = force
-        return self.force
+        self._table.nodal_loads[self._index] = force.get_values()
+        self._table.modified("nodal_loads")
+        return force
 
     def get_force(self):
         """
         Get the force vector associated with the node"
         """
-        return self.force.get_values()
+        return self._table.nodal_loads[self._index].tolist()
 
     def set_constraint(self, boundary_conditions: Constraint):
         """
@@ -46,8 +108,9 @@ class Node():
         """
         if not isinstance(boundary_conditions, Constraint):
             raise TypeError("Expected a constraint object.")
-        self.constraint = boundary_conditions
-        return self.constraint
+        self._table.constraint_mask[self._index] = boundary_conditions.get_values()
+        self._table.modified("constraint_mask")
+        return boundary_conditions
         
     def get_constraint(self):
         """
@@ -60,14 +123,13 @@ class Node():
         Enumerate the DOFs for this node, using `-1` for constrained DOFs
         and incrementing the global counter for free DOFs.
         """
-        print(f"Enumerating DOF for node at {self.position} with constraint: {self.constraint.fixed}")
         for i, is_constrained in enumerate(self.constraint.fixed):
             if is_constrained:
                 self.dof_number[i] = -1
             else:
                 self.dof_number[i] = counter
                 counter += 1
-        print(f"Assigned DOF numbers: {self.dof_number}")
+        logger.debug("Assigned DOF numbers %s to node at %s", self.dof_number, self.position)
         return counter
     
     def get_dof_number(self):
@@ -86,8 +148,7 @@ class Node():
         """
         Set the displacement of the node.
         """
-        dist = np.array(displacement)
-        self.displacement = dist
+        self.displacement = displacement
 
     def get_displacement(self):
         """
@@ -0,0 +1,68 @@
+class Operators:
+    def __init__(self, structure):
+        """
+        Lazy operator layer of a structure: K, M, C and f are built on first access,
+        memoized and shared by the static, modal and dynamic analyses. Each one is
+        rebuilt (or patched) only when the model data it depends on has changed.
+        """
+        self.structure = structure
+        self._load_vector = None
+        self._load_state = None
+        self._damping = None
+        self._damping_state = None
+
+    def ensure_dofs(self):
+        """
+        Make sure the DOFs are enumerated for the current topology and constraints,
+        without renumbering when nothing changed.
+        """
+        self.structure.ensure_dof_numbering()
+        if self.structure.num_dof == 0:
+            raise ValueError("DOF enumeration must be run before assembling stiffness matrix.")
+        return self.structure.num_dof
+
+    @property
+    def num_dof(self):
+        return self.ensure_dofs()
+
+    @property
+    def K(self):
+        """
+        Global sparse stiffness matrix.
+        """
+        self.ensure_dofs()
+        return self.structure._cached_matrix("stiffness")
+
+    @property
+    def M(self):
+        """
+        Global sparse consistent mass matrix.
+        """
+        self.ensure_dofs()
+        return self.structure._cached_matrix("mass")
+
+    @property
+    def f(self):
+        """
+        Global (num_dof, 1) load vector of the current nodal loads.
+        """
+        structure = self.structure
+        self.ensure_dofs()
+        state = structure._topology_state() + structure.node_table.state("nodal_loads")
+        if self._load_state != state:
+            self._load_vector = structure._load_vector()
+            self._load_state = state
+        return self._load_vector
+
+    def C(self, alpha_1, alpha_2):
+        """
+        Rayleigh damping matrix C = alpha_1 * M + alpha_2 * K, memoized per coefficient pair.
+        """
+        K, M = self.K, self.M
+        structure = self.structure
+        state = (alpha_1, alpha_2, structure._topology_state(), structure.node_table.state("coordinates"),
+                 structure.element_table.state("e_modulus", "area", "density"))
+        if self._damping_state != state:
+            self._damping = (alpha_1 * M + alpha_2 * K).tocsr()
+            self._damping_state = state
+        return self._damping
@@ -0,0 +1,44 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+def node_adjacency(connectivity, num_nodes):
+    """
+    Build the symmetric node adjacency graph (CSR) from the element connectivity.
+    """
+    connectivity = np.asarray(connectivity, dtype=np.int64).reshape(-1, 2)
+    rows = np.concatenate([connectivity[:, 0], connectivity[:, 1]])
+    cols = np.concatenate([connectivity[:, 1], connectivity[:, 0]])
+    values = np.ones(len(rows))
+    return sp.coo_matrix((values, (rows, cols)), shape=(num_nodes, num_nodes)).tocsr()
+
+def rcm_node_order(connectivity, num_nodes):
+    """
+    Reverse Cuthill-McKee ordering of the nodes, returned as the list of node
+    indices in their new numbering order.
+    """
+    graph = node_adjacency(connectivity, num_nodes)
+    return np.asarray(reverse_cuthill_mckee(graph, symmetric_mode=True), dtype=np.int64)
+
+def bandwidth_profile(dof_maps, num_dof):
+    """
+    Compute the half-bandwidth and the profile (skyline size below the diagonal)
+    of the global matrix described by the element DOF maps. Constrained DOFs (-1)
+    are ignored.
+    """
+    dof_maps = np.asarray(dof_maps, dtype=np.int64)
+    free = dof_maps != -1
+    if num_dof == 0 or not free.any():
+        return 0, 0
+
+    # Smallest and largest free DOF of every element
+    lowest = np.where(free, dof_maps, num_dof).min(axis=1)
+    highest = np.where(free, dof_maps, -1).max(axis=1)
+    bandwidth = int((highest - lowest)[highest >= 0].max())
+
+    # First nonzero column of every row: the smallest DOF of any element touching it
+    first_column = np.arange(num_dof)
+    element_lowest = np.broadcast_to(lowest[:, None], dof_maps.shape)
+    np.minimum.at(first_column, dof_maps[free], element_lowest[free])
+    profile = int((np.arange(num_dof) - first_column).sum())
+    return bandwidth, profile
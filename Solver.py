@@ -0,0 +1,217 @@
+import warnings
+from collections import OrderedDict
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from Instrumentation import count_kernel
+
+class DirectSolver:
+    def __init__(self, K):
+        """
+        Factorize the reduced sparse stiffness matrix once (sparse LU).
+        Every later solve is only a forward/back substitution.
+        """
+        self.K = sp.csc_matrix(K)
+        self.num_dof = self.K.shape[0]
+        # The stiffness is symmetric positive definite, so a symmetric ordering
+        # with diagonal pivoting keeps the fill-in close to a Cholesky factor
+        self.factor = spla.splu(self.K, permc_spec="MMD_AT_PLUS_A",
+                                diag_pivot_thresh=0.0, options={"SymmetricMode": True})
+        self.num_solves = 0
+
+    def solve(self, f):
+        """
+        Solve K u = f for one load vector (num_dof,) / (num_dof, 1) or a
+        (num_dof, n_cases) matrix of load vectors.
+        """
+        f = np.asarray(f, dtype=float)
+        if f.shape[0] != self.num_dof:
+            raise ValueError(f"Load vector has {f.shape[0]} rows, expected {self.num_dof}.")
+        self.num_solves += 1
+        return self.factor.solve(f)
+
+class FactorCache:
+    def __init__(self, maxsize=4):
+        """
+        Least-recently-used cache of matrix factorizations keyed by a hashable
+        value (e.g. the time step of an integrator). `hits` and `misses` count
+        the lookups since creation.
+        """
+        if maxsize < 1:
+            raise ValueError("The factor cache must hold at least one factorization.")
+        self.maxsize = maxsize
+        self._factors = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._factors)
+
+    def __contains__(self, key):
+        return key in self._factors
+
+    def get(self, key, factorize):
+        """
+        Get the factorization stored under `key`, calling `factorize()` to build it
+        on a miss. The least recently used entry is evicted when the cache is full.
+        """
+        if key in self._factors:
+            self.hits += 1
+            self._factors.move_to_end(key)
+            return self._factors[key]
+        self.misses += 1
+        factor = factorize()
+        self._factors[key] = factor
+        if len(self._factors) > self.maxsize:
+            self._factors.popitem(last=False)
+        return factor
+
+    def stats(self):
+        """
+        Get {"hits": ..., "misses": ..., "size": ..., "maxsize": ...}.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self), "maxsize": self.maxsize}
+
+    def clear(self):
+        """
+        Drop all factorizations and reset the counters.
+        """
+        self._factors.clear()
+        self.hits = 0
+        self.misses = 0
+
+class ElementOperator(spla.LinearOperator):
+    def __init__(self, blocks, dof_maps, num_dof):
+        """
+        Matrix-free stiffness operator K @ u computed from the stack of element
+        blocks, so the global matrix is never formed.
+        """
+        super().__init__(dtype=float, shape=(num_dof, num_dof))
+        self.blocks = np.asarray(blocks, dtype=float)
+        dof_maps = np.asarray(dof_maps, dtype=np.int64)
+        # Constrained DOFs (-1) read from and write to one extra dummy slot
+        self.slots = np.where(dof_maps == -1, num_dof, dof_maps)
+        self.num_dof = num_dof
+
+    def _matvec(self, u):
+        count_kernel("element_matvec", len(self.blocks))
+        u_padded = np.append(np.ravel(u), 0.0)
+        y_local = np.einsum("eij,ej->ei", self.blocks, u_padded[self.slots])
+        return np.bincount(self.slots.ravel(), weights=y_local.ravel(), minlength=self.num_dof + 1)[:-1]
+
+    def _rmatvec(self, u):
+        # The element blocks are symmetric
+        return self._matvec(u)
+
+    def diagonal(self):
+        """
+        Diagonal of the global stiffness, summed from the element block diagonals.
+        """
+        diagonal = np.einsum("eii->ei", self.blocks)
+        return np.bincount(self.slots.ravel(), weights=diagonal.ravel(), minlength=self.num_dof + 1)[:-1]
+
+class IterativeSolver:
+    preconditioners = ("none", "jacobi", "ssor")
+
+    def __init__(self, K, preconditioner="jacobi", tol=1e-10, maxiter=None, omega=1.0):
+        """
+        Preconditioned conjugate gradient solver for the SPD reduced stiffness.
+        `K` is a sparse matrix or a matrix-free ElementOperator.
+        Preconditioners: "none", "jacobi" or "ssor" (symmetric SOR with relaxation
+        `omega` in (0, 2), needs an assembled K).
+        """
+        if preconditioner not in self.preconditioners:
+            raise ValueError(f"Unknown preconditioner '{preconditioner}', expected one of {self.preconditioners}.")
+
+        self.K = K if isinstance(K, spla.LinearOperator) else sp.csr_matrix(K)
+        self.num_dof = self.K.shape[0]
+        self.preconditioner = preconditioner
+        self.tol = tol
+        self.maxiter = maxiter if maxiter is not None else 10 * self.num_dof
+
+        if preconditioner == "jacobi":
+            diagonal = self.K.diagonal()
+            self._apply_preconditioner = lambda r: r / diagonal
+        elif preconditioner == "ssor":
+            if isinstance(self.K, spla.LinearOperator):
+                raise ValueError("The 'ssor' preconditioner needs an assembled stiffness matrix.")
+            if not 0 < omega < 2:
+                raise ValueError("The SSOR relaxation factor must lie in (0, 2).")
+            self._apply_preconditioner = self._ssor(omega)
+        else:
+            self._apply_preconditioner = lambda r: r
+
+        # Convergence record of the last solve, one entry per load vector
+        self.history = []
+        self.iterations = []
+        self.converged = []
+
+    def _ssor(self, omega):
+        """
+        Build the SSOR preconditioner
+        M^-1 r = (2 - w)/w (D/w + U)^-1 (D/w) (D/w + L)^-1 r,
+        which stays symmetric positive definite, as CG requires.
+        """
+        scaled_diagonal = self.K.diagonal() / omega
+        lower = sp.csr_matrix(sp.tril(self.K, k=-1) + sp.diags(scaled_diagonal))
+        upper = sp.csr_matrix(sp.triu(self.K, k=1) + sp.diags(scaled_diagonal))
+        factor = (2 - omega) / omega
+
+        def apply(r):
+            y = spla.spsolve_triangular(lower, r, lower=True)
+            return factor * spla.spsolve_triangular(upper, scaled_diagonal * y, lower=False)
+        return apply
+
+    def solve(self, f):
+        """
+        Solve K u = f for one load vector or a (num_dof, n_cases) matrix of load vectors.
+        """
+        f = np.asarray(f, dtype=float)
+        if f.shape[0] != self.num_dof:
+            raise ValueError(f"Load vector has {f.shape[0]} rows, expected {self.num_dof}.")
+
+        columns = f.reshape(self.num_dof, -1)
+        u = np.zeros_like(columns)
+        self.history, self.iterations, self.converged = [], [], []
+        for j in range(columns.shape[1]):
+            u[:, j] = self._pcg(columns[:, j])
+        return u.reshape(f.shape)
+
+    def _pcg(self, b):
+        """
+        Preconditioned conjugate gradient iterations for a single right-hand side.
+        """
+        x = np.zeros_like(b)
+        b_norm = np.linalg.norm(b)
+        if b_norm == 0:
+            self.history.append([0.0])
+            self.iterations.append(0)
+            self.converged.append(True)
+            return x
+
+        r = b.copy()
+        z = self._apply_preconditioner(r)
+        p = z.copy()
+        rz = r @ z
+        history = [1.0]
+        for _ in range(self.maxiter):
+            Kp = self.K @ p
+            alpha = rz / (p @ Kp)
+            x += alpha * p
+            r -= alpha * Kp
+            history.append(np.linalg.norm(r) / b_norm)
+            if history[-1] <= self.tol:
+                break
+            z = self._apply_preconditioner(r)
+            rz_new = r @ z
+            p = z + (rz_new / rz) * p
+            rz = rz_new
+
+        converged = history[-1] <= self.tol
+        if not converged:
+            warnings.warn(f"CG did not converge in {self.maxiter} iterations "
+                          f"(relative residual {history[-1]:.3e}).")
+        self.history.append(history)
+        self.iterations.append(len(history) - 1)
+        self.converged.append(converged)
+        return x
@@ -0,0 +1,71 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+class SpatialIndex:
+    def __init__(self, coordinates):
+        """
+        KD-tree over node coordinates for nearest-node lookups, box and sphere
+        selections and tolerance-based detection of coincident nodes.
+        All queries return node indices in ascending order.
+        """
+        self.coordinates = np.array(coordinates, dtype=float).reshape(-1, 3)
+        self.tree = cKDTree(self.coordinates)
+
+    def __len__(self):
+        return len(self.coordinates)
+
+    def nearest(self, points, k=1):
+        """
+        Get the distances and indices of the `k` nearest nodes of every point.
+        """
+        return self.tree.query(np.asarray(points, dtype=float), k=k)
+
+    def find(self, point, tolerance=1e-9):
+        """
+        Get the index of the node within `tolerance` of `point`, or None.
+        The lowest index wins when several nodes qualify.
+        """
+        if len(self) == 0:
+            return None
+        matches = self.within_sphere(point, tolerance)
+        return int(matches[0]) if len(matches) else None
+
+    def within_sphere(self, center, radius):
+        """
+        Get the nodes at a distance of at most `radius` from `center`.
+        """
+        return np.array(sorted(self.tree.query_ball_point(np.asarray(center, dtype=float), radius)),
+                        dtype=np.int64)
+
+    def within_box(self, lower, upper):
+        """
+        Get the nodes inside the axis-aligned box [lower, upper] (bounds included).
+        """
+        lower, upper = np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+        if np.any(lower > upper):
+            raise ValueError("Every lower box bound must not exceed the upper bound.")
+        # Candidates from the enclosing cube in the max norm, then the exact box test
+        center = (lower + upper) / 2
+        candidates = np.array(sorted(self.tree.query_ball_point(center, np.max(upper - center), p=np.inf)),
+                              dtype=np.int64)
+        if candidates.size == 0:
+            return candidates
+        points = self.coordinates[candidates]
+        return candidates[np.all((points >= lower) & (points <= upper), axis=1)]
+
+    def duplicate_groups(self, tolerance=1e-9):
+        """
+        Label clusters of coincident nodes: nodes closer than `tolerance` share a
+        label, chained transitively. The label of a cluster is its lowest node index,
+        so the result does not depend on the order of the tree queries.
+        """
+        pairs = self.tree.query_pairs(tolerance, output_type="ndarray")
+        n = len(self)
+        graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+        _, components = connected_components(graph, directed=False)
+        # Map every component to its lowest node index
+        representative = np.full(components.max() + 1 if n else 0, n, dtype=np.int64)
+        np.minimum.at(representative, components, np.arange(n))
+        return representative[components]
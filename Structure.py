@@ -1,17 +1,42 @@
 from Node import Node
 from Element import Element
+from Constraint import Constraint
+from Force import Force
+from Assembly import AssemblyPlan, ElementMatrixCache
+from Solver import DirectSolver, IterativeSolver, ElementOperator
+from Renumbering import rcm_node_order, bandwidth_profile
+from LoadCase import LoadCaseResults
+from Operators import Operators
+from Tables import NodeTable, ElementTable, TableViews, read_only
+from SpatialIndex import SpatialIndex
+from Instrumentation import PhaseTimer, logger, profile_phase, record_matrix
+import Kernels
 import numpy as np
-import pandas as pd
 
 class Structure:
     def __init__(self):
         """
-        Initialize a Structure object with empty lists for nodes and elements.
-        """
-        self.nodes = []
-        self.elements = []
-        self._node_set = set()
-        
+        Initialize a Structure object with empty node and element tables.
+        `nodes` and `elements` are lazy sequences of thin views over those tables.
+        """
+        self.node_table = NodeTable()
+        self.element_table = ElementTable(self.node_table)
+        self.nodes = TableViews(self.node_table, Node.view)
+        self.elements = TableViews(self.element_table, Element.view)
+        self.num_dof = 0
+        self.dof_ordering = "none"
+        self._node_order = None
+        self._node_order_state = None
+        self._dof_state = None
+        self._plan = None
+        self._plan_state = None
+        self._matrix_caches = {}
+        self._factorization = None
+        self._factorization_state = None
+        self._spatial_index = None
+        self._spatial_index_state = None
+        self.operators = Operators(self)
+        self.timings = PhaseTimer()
 
     def __str__(self):
         return f"Structure with {len(self.nodes)} nodes and {len(self.elements)} elements."
@@ -20,10 +45,9 @@ class Structure:
         """
         Add a node to the structure.
         """
-        single_nodal = Node(x1, x2, x3)
-        self.nodes.append(single_nodal)
-        self._node_set.add(single_nodal)
-        print(single_nodal)
+        index = self.node_table.append([x1, x2, x3])
+        single_nodal = Node.view(self.node_table, index)
+        logger.debug("Added %s", single_nodal)
         return single_nodal
         
     
@@ -31,12 +55,202 @@ class Structure:
         """
         Add an element to the structure.
         """
-        single_element = Element(e_modulus, area, density, node1, node2)
-        self.elements.append(single_element)
-        self._node_set.add(node1)
-        self._node_set.add(node2)
+        # Nodes created outside the structure are copied into the node table
+        for node in (node1, node2):
+            if node._table is not self.node_table:
+                node._move_to(self.node_table)
+
+        index = self.element_table.append([node1.index, node2.index], e_modulus, area, density)
+        single_element = Element.view(self.element_table, index)
         return single_element
 
+    def add_nodes(self, coordinates):
+        """
+        Add many nodes at once from an (n, 3) coordinate array.
+        Returns the indices of the new nodes.
+        """
+        coordinates = np.asarray(coordinates, dtype=float)
+        if coordinates.ndim != 2 or coordinates.shape[1] != 3:
+            raise ValueError("Expected an (n, 3) array of node coordinates.")
+        return self.node_table.extend(coordinates)
+
+    def add_elements(self, connectivity, e_modulus, area, density):
+        """
+        Add many elements at once from an (n, 2) array of node indices.
+        E, A and rho may be scalars or one value per element.
+        Returns the indices of the new elements.
+        """
+        connectivity = np.asarray(connectivity, dtype=np.int64)
+        if connectivity.ndim != 2 or connectivity.shape[1] != 2:
+            raise ValueError("Expected an (n, 2) array of node indices.")
+        self._check_node_indices(connectivity)
+
+        n = len(connectivity)
+        properties = []
+        for name, value in (("e_modulus", e_modulus), ("area", area), ("density", density)):
+            value = np.asarray(value, dtype=float)
+            if value.ndim > 1 or (value.ndim == 1 and len(value) != n):
+                raise ValueError(f"Expected a scalar or {n} values for {name}, got shape {value.shape}.")
+            properties.append(np.broadcast_to(value, (n,)))
+        return self.element_table.extend(connectivity, *properties)
+
+    def _check_node_indices(self, node_indices):
+        """
+        Validate node indices: negative indices are rejected rather than wrapped around.
+        """
+        node_indices = np.asarray(node_indices, dtype=np.int64)
+        if node_indices.size and (node_indices.min() < 0 or node_indices.max() >= len(self.nodes)):
+            raise IndexError("Node index out of range.")
+        return node_indices
+
+    def set_constraints(self, node_indices, constraint):
+        """
+        Set the boundary conditions of many nodes at once.
+        `constraint` is a Constraint, a (3,) mask or one (3,) mask per node.
+        """
+        if isinstance(constraint, Constraint):
+            constraint = constraint.get_values()
+        node_indices = self._check_node_indices(node_indices)
+        self.node_table.constraint_mask[node_indices] = np.asarray(constraint, dtype=bool)
+        self.node_table.modified("constraint_mask")
+
+    def set_forces(self, node_indices, force):
+        """
+        Set the nodal forces of many nodes at once.
+        `force` is a Force, a (3,) vector or one (3,) vector per node.
+        """
+        if isinstance(force, Force):
+            force = force.get_values()
+        node_indices = self._check_node_indices(node_indices)
+        self.node_table.nodal_loads[node_indices] = np.asarray(force, dtype=float)
+        self.node_table.modified("nodal_loads")
+
+    def set_coordinates(self, node_indices, coordinates):
+        """
+        Move many nodes at once. `coordinates` is a (3,) position or one (3,) row per node.
+        """
+        node_indices = self._check_node_indices(node_indices)
+        self.node_table.coordinates[node_indices] = np.asarray(coordinates, dtype=float)
+        self.node_table.modified("coordinates", rows=node_indices)
+
+    def set_element_properties(self, element_indices, e_modulus=None, area=None, density=None):
+        """
+        Change E, A and/or rho of many elements at once; only those elements
+        are recomputed at the next assembly.
+        """
+        element_indices = np.asarray(element_indices, dtype=np.int64)
+        if element_indices.size and (element_indices.min() < 0 or element_indices.max() >= len(self.elements)):
+            raise IndexError("Element index out of range.")
+        for name, value in (("e_modulus", e_modulus), ("area", area), ("density", density)):
+            if value is not None:
+                getattr(self.element_table, name)[element_indices] = value
+                self.element_table.modified(name, rows=element_indices)
+
+    def spatial_index(self):
+        """
+        Get the KD-tree over the node coordinates, rebuilt only after nodes were added or moved.
+        """
+        state = self.node_table.state("coordinates")
+        if self._spatial_index is None or self._spatial_index_state != state:
+            self._spatial_index = SpatialIndex(self.node_table.coordinates)
+            self._spatial_index_state = state
+        return self._spatial_index
+
+    def find_node(self, point, tolerance=1e-9):
+        """
+        Get the index of the node within `tolerance` of `point`, or None.
+        """
+        return self.spatial_index().find(point, tolerance)
+
+    def nearest_nodes(self, points, k=1):
+        """
+        Get the distances and indices of the `k` nearest nodes of every point.
+        """
+        return self.spatial_index().nearest(points, k)
+
+    def nodes_in_box(self, lower, upper):
+        """
+        Get the indices of the nodes inside the box [lower, upper], e.g. for set_constraints.
+        """
+        return self.spatial_index().within_box(lower, upper)
+
+    def nodes_in_sphere(self, center, radius):
+        """
+        Get the indices of the nodes within `radius` of `center`.
+        """
+        return self.spatial_index().within_sphere(center, radius)
+
+    def merge_coincident_nodes(self, tolerance=1e-9):
+        """
+        Merge nodes closer than `tolerance` into the lowest-indexed node of each cluster.
+        Constraints of merged nodes are combined and their loads summed, elements are
+        reconnected and elements collapsed to zero length are removed.
+        Node and element indices change, so existing Node and Element views become
+        invalid. Returns the (n_old_nodes,) array mapping old to new node indices.
+        """
+        labels = self.spatial_index().duplicate_groups(tolerance)
+        kept = np.flatnonzero(labels == np.arange(len(labels)))
+        if len(kept) == len(labels):
+            return np.arange(len(labels))
+        new_index = np.empty(len(labels), dtype=np.int64)
+        new_index[kept] = np.arange(len(kept))
+        node_map = new_index[labels]
+
+        table = self.node_table
+        constraint_mask = np.zeros((len(kept), 3), dtype=bool)
+        np.logical_or.at(constraint_mask, node_map, table.constraint_mask)
+        nodal_loads = np.zeros((len(kept), 3))
+        np.add.at(nodal_loads, node_map, table.nodal_loads)
+        table.take(kept)
+        table.constraint_mask[:] = constraint_mask
+        table.nodal_loads[:] = nodal_loads
+        table.displacements[:] = 0.0
+
+        connectivity = node_map[self.element_table.connectivity]
+        valid = connectivity[:, 0] != connectivity[:, 1]
+        self.element_table.take(np.flatnonzero(valid))
+        self.element_table.connectivity[:] = connectivity[valid]
+        self.element_table.modified()
+        logger.info("Merged %d coincident nodes, removed %d collapsed elements",
+                    len(labels) - len(kept), int((~valid).sum()))
+        return node_map
+
+    @property
+    def coordinates(self):
+        """
+        (n_nodes, 3) read-only array of node coordinates, changed through set_coordinates.
+        """
+        return read_only(self.node_table.coordinates)
+
+    @property
+    def constraint_mask(self):
+        """
+        (n_nodes, 3) read-only boolean array, True where a DOF is fixed.
+        Changed through set_constraints.
+        """
+        return read_only(self.node_table.constraint_mask)
+
+    @property
+    def nodal_loads(self):
+        """
+        (n_nodes, 3) read-only array of applied nodal forces, changed through set_forces.
+        """
+        return read_only(self.node_table.nodal_loads)
+
+    @property
+    def dof_map(self):
+        """
+        (n_nodes, 3) array of global DOF numbers, `-1` for constrained DOFs.
+        """
+        return self.node_table.dof_map
+
+    @property
+    def connectivity(self):
+        """
+        (n_elem, 2) read-only array of node indices of every element.
+        """
+        return read_only(self.element_table.connectivity)
+
     def get_number_of_nodes(self):
         """
         Get the number of nodes in the structure.
@@ -70,208 +284,379 @@ class Structure:
         for element in self.elements:
             print(element)
 
-    def solve(self):
+    @profile_phase("static_solve")
+    def solve(self, sparse=True, method="direct", preconditioner="jacobi", tol=1e-10,
+              maxiter=None, matrix_free=False, omega=1.0):
         """
         Solve the reduced system only for free DOFs.
+        `method` is "direct" (cached sparse factorization) or "cg" (preconditioned
+        conjugate gradient, optionally `matrix_free`, with `omega` as SSOR relaxation).
+        Set `sparse` to False to fall back to dense matrices on tiny models
+        (direct method only).
         """
-        print("Solving structure...")
+        logger.info("Solving structure...")
         
-        # enumerate dof
-        self.enumerate_dof()
-        
-        # Initialize stiffness matrix, mass matrix, and force vector
-        n = self.num_dof
-        if self.num_dof == 0:
-            raise ValueError("DOF enumeration must be run before assembling stiffness matrix.")
+        if method == "cg":
+            if not sparse:
+                raise ValueError("The CG solver works on sparse or matrix-free operators only.")
+            solver = self.iterative_solver(preconditioner, tol, maxiter, matrix_free, omega)
+        elif method != "direct":
+            raise ValueError(f"Unknown solution method '{method}'.")
+        elif sparse:
+            # Reuses the cached factorization while the model is unchanged
+            solver = self.factorize()
+        else:
+            self.operators.ensure_dofs()
+            self.K_global = self.operators.K.toarray()
+            record_matrix("K", self.K_global)
         
-        self.K_global = np.zeros((n, n))
-        self.m_global = np.zeros((n, n))
-        self.f_global = np.zeros((n, 1))
+        # Memoized force vector, a static solve needs no mass matrix
+        self.f_global = self.operators.f
         
-        # Loop for stiffness matrix
-        for element in self.elements:
-            k_local = element.compute_stiffness_matrix()  # 6x6
-            dof_map = element.node1.dof_number + element.node2.dof_number  # length 6
+        # Constrained DOFs are numbered -1 and never enter the global system,
+        # so every global DOF is free and K_global is already the reduced matrix.
+        # The matrix-free CG path never forms K_global at all.
+        f_f = self.f_global
 
-            for i_local, i_global in enumerate(dof_map):
-                if i_global == -1:
-                    continue  # constrained DOF
+        # Solve reduced system
+        with self.timings.phase("solve"):
+            if method == "cg" or sparse:
+                u_f = solver.solve(f_f)
+            else:
+                K_ff = self.K_global
+                logger.debug("K reduced:\n%s", K_ff)
+                u_f = np.linalg.solve(K_ff, f_f)
 
-                for j_local, j_global in enumerate(dof_map):
-                    if j_global == -1:
-                        continue
-                    self.K_global[i_global, j_global] += k_local[i_local, j_local]
-        
-        # Loop for mass matrix
-        for element in self.elements:
-            m_local = element.compute_mass_matrix()  # 6x6
-            dof_map = element.node1.dof_number + element.node2.dof_number  # length 6
+        self.U_global = u_f
+        self.displacement = u_f
+
+        # Assign displacements back to nodes, zero for constrained DOFs
+        with self.timings.phase("recovery"):
+            self.node_table.displacements[:] = Kernels.gather_element_displacements(self.dof_map, self.displacement)
+
+        logger.debug("Nodal displacements:\n%s", self.displacement)
+
+    def reduce_loads(self, loads):
+        """
+        Map nodal load vectors onto the free DOFs.
+        `loads` is (3 * n_nodes,) for one case, (3 * n_nodes, n_cases) with
+        x, y, z per node, or (n_nodes, 3, n_cases). Components on constrained
+        DOFs are dropped. Returns a (num_dof, n_cases) matrix.
+        """
+        loads = np.asarray(loads, dtype=float)
+        n_values = 3 * len(self.nodes)
+        if loads.ndim == 3:
+            loads = loads.reshape(n_values, -1)
+        loads = loads.reshape(loads.shape[0], -1)
+        if loads.shape[0] != n_values:
+            raise ValueError(f"Load matrix has {loads.shape[0]} rows, expected {n_values} (3 per node).")
+
+        with self.timings.phase("bc_reduction"):
+            dofs = self.dof_map.ravel()
+            free = dofs != -1
+            f_free = np.zeros((self.num_dof, loads.shape[1]))
+            f_free[dofs[free]] = loads[free]
+        return f_free
+
+    def solve_load_cases(self, loads, names=None):
+        """
+        Solve many static load cases against a single cached factorization.
+        `loads` holds one nodal load vector per column (see reduce_loads).
+        Returns a LoadCaseResults with per-case displacements and axial forces;
+        node displacements are left untouched.
+        """
+        solver = self.factorize()
+        f_free = self.reduce_loads(loads)
+        with self.timings.phase("solve"):
+            U = solver.solve(f_free).reshape(self.num_dof, -1)
+
+        with self.timings.phase("recovery"):
+            coordinates, connectivity, e_modulus, area, _ = self.element_arrays()
+            N = Kernels.axial_forces(coordinates, connectivity, e_modulus, area, self.element_dof_maps(), U)
+        return LoadCaseResults(self.dof_map, U, N.reshape(len(connectivity), -1), names)
+
+    def _stiffness_state(self):
+        """
+        Snapshot of everything the reduced stiffness matrix depends on:
+        geometry, constraints, connectivity, element properties and DOF ordering.
+        """
+        return (self.node_table.state("coordinates", "constraint_mask")
+                + self.element_table.state("connectivity", "e_modulus", "area")
+                + (self.dof_ordering,))
+
+    def factorize(self):
+        """
+        Factorize the reduced sparse stiffness matrix and cache the factor on the structure.
+        The factor is rebuilt only when geometry, properties or constraints have changed.
+        """
+        state = self._stiffness_state()
+        if self._factorization is None or self._factorization_state != state:
+            self.K_global = self.operators.K
+            record_matrix("K", self.K_global)
+            with self.timings.phase("factorization"):
+                self._factorization = DirectSolver(self.K_global)
+            self._factorization_state = state
+        return self._factorization
+
+    def iterative_solver(self, preconditioner="jacobi", tol=1e-10, maxiter=None, matrix_free=False,
+                         omega=1.0):
+        """
+        Build a preconditioned CG solver for the reduced stiffness. With `matrix_free`
+        the operator works directly on the element blocks and K_global is never formed.
+        The convergence history of the last solve is kept on the returned solver.
+        """
+        self.operators.ensure_dofs()
+        if matrix_free:
+            blocks = self._element_blocks("stiffness")
+            K = ElementOperator(blocks, self.element_dof_maps(), self.num_dof)
+        else:
+            self.K_global = self.operators.K
+            K = self.K_global
+            record_matrix("K", K)
 
-            for i_local, i_global in enumerate(dof_map):
-                if i_global == -1:
-                    continue  # constrained DOF
+        # Preconditioner setup is the iterative counterpart of the factorization
+        with self.timings.phase("factorization"):
+            self.iterative = IterativeSolver(K, preconditioner, tol, maxiter, omega)
+        return self.iterative
 
-                for j_local, j_global in enumerate(dof_map):
-                    if j_global == -1:
-                        continue
-                    self.m_global[i_global, j_global] += m_local[i_local, j_local]
-        
-        # Loop for force vector
-        for node in self.nodes:
-            if node.force is None:
-                continue
-            for i, dof in enumerate(node.dof_number):
-                if dof != -1:
-                    self.f_global[dof] += node.force[i]
-        
-        # Identify free DOF indices
-        free_dofs = []
-        for node in self._node_set:
-            for dof in node.dof_number:
-                if dof != -1:
-                    free_dofs.append(dof)
-
-        # Convert to numpy arrays
-        K_ff = self.K_global[np.ix_(free_dofs, free_dofs)]
-        f_f = self.f_global[free_dofs]
-        print("K reduced:")
-        print(pd.DataFrame(K_ff))
-
-        # Solve reduced system
-        u_f = np.linalg.solve(K_ff, f_f)
+    def timing_report(self, reset=False):
+        """
+        Get the accumulated wall time and call count per analysis phase as a dict
+        (enumerate, element_kernels, assembly, bc_reduction, factorization, solve,
+        recovery and total). Cached steps that are skipped add no time.
+        """
+        report = self.timings.report()
+        if reset:
+            self.timings.reset()
+        return report
 
-        self.U_global = u_f
+    def mark_modified(self):
+        """
+        Invalidate every cached matrix and factorization.
+        Call this after writing to the node or element table arrays directly.
+        """
+        self.node_table.modified()
+        self.element_table.modified()
 
-        # Fill full displacement vector with zeros initially
-        full_disp = np.zeros((len(self.f_global), 1))
+    def enumerate_dof(self, reorder=None):
+        """
+        Enumerate global DOFs for all nodes in the structure.
+        `reorder="rcm"` switches to reverse Cuthill-McKee node ordering and
+        `reorder="none"` back to insertion order; the choice is kept for later
+        enumerations. The bandwidth and profile before and after the reordering
+        are stored in `renumbering_report`.
+        """
+        with self.timings.phase("enumerate"):
+            counter = self._enumerate_dof(reorder)
+        self._dof_state = self._topology_state()
+        return counter
 
-        for idx, dof in enumerate(free_dofs):
-            full_disp[dof] = u_f[idx]
+    def ensure_dof_numbering(self):
+        """
+        Enumerate the DOFs only when the connectivity, the constraints or the
+        ordering changed since the last enumeration. Needs no assembly plan, so
+        matrix-free solves never build the sparsity pattern.
+        """
+        if self._dof_state != self._topology_state():
+            self.enumerate_dof()
+        return self.num_dof
+
+    def _enumerate_dof(self, reorder):
+        logger.info("Enumerating global DOFs...")
+        if reorder is not None:
+            if reorder not in ("none", "rcm"):
+                raise ValueError(f"Unknown DOF ordering '{reorder}', expected 'none' or 'rcm'.")
+            before = self._bandwidth_profile(self.node_order())
+            self.dof_ordering = reorder
+            after = self._bandwidth_profile(self.node_order())
+            self.renumbering_report = {
+                "ordering": reorder,
+                "bandwidth_before": before[0], "profile_before": before[1],
+                "bandwidth_after": after[0], "profile_after": after[1],
+            }
+            logger.info("DOF renumbering (%s): bandwidth %d -> %d, profile %d -> %d",
+                        reorder, before[0], after[0], before[1], after[1])
+
+        dof_map, counter = self._numbering(self.node_order())
+        self.dof_map[:] = dof_map
+        self.num_dof = counter
+        return counter
 
-        self.displacement = full_disp
+    def _numbering(self, order):
+        """
+        Number the free DOFs node by node (x, y, z) following the node sequence `order`.
+        Returns the (n_nodes, 3) DOF map and the number of free DOFs.
+        """
+        free = ~self.constraint_mask[order].ravel()
+        numbers = np.cumsum(free) - 1
+        dof_map = np.empty((len(order), 3), dtype=np.int64)
+        dof_map[order] = np.where(free, numbers, -1).reshape(-1, 3)
+        return dof_map, int(free.sum())
 
-        # Assign displacements back to nodes
-        for node in self._node_set:
-            disp = []
-            for dof in node.dof_number:
-                if dof == -1:
-                    disp.append(0.0)
-                else:
-                    disp.append(float(self.displacement[dof]))
-            node.displacement = disp
+    def _bandwidth_profile(self, order):
+        """
+        Bandwidth and profile of the global matrix for the node sequence `order`.
+        """
+        dof_map, num_dof = self._numbering(order)
+        return bandwidth_profile(dof_map[self.connectivity].reshape(-1, 6), num_dof)
+
+    def node_order(self):
+        """
+        Get the node sequence used for DOF numbering: insertion order, or the
+        reverse Cuthill-McKee order of the element graph (cached per topology).
+        """
+        if self.dof_ordering == "none":
+            return np.arange(len(self.nodes))
+        state = self.element_table.state("connectivity") + (len(self.nodes),)
+        if self._node_order_state != state:
+            self._node_order = rcm_node_order(self.connectivity, len(self.nodes))
+            self._node_order_state = state
+        return self._node_order
+
+    def element_dof_maps(self):
+        """
+        Get the (n_elem, 6) array of global DOF numbers of every element.
+        """
+        return self.dof_map[self.connectivity].reshape(-1, 6)
 
-        print("Nodal displacements:")
-        print(self.displacement)
+    def element_arrays(self):
+        """
+        Get node coordinates, element connectivity and per-element E, A and rho
+        as arrays for the batched element kernels.
+        """
+        elements = self.element_table
+        return (self.coordinates, self.connectivity, read_only(elements.e_modulus),
+                read_only(elements.area), read_only(elements.density))
 
-        # print("Nodal displacements:")
-        # for i, node in enumerate(self.nodes):
-        #     print(f"Node {i+1}: {self.displacement}")
+    def _element_blocks(self, kind, elements=None):
+        """
+        Compute the stiffness or mass blocks of all elements, or only of `elements`.
+        """
+        coordinates, connectivity, e_modulus, area, density = self.element_arrays()
+        if elements is not None:
+            connectivity, e_modulus, area, density = (connectivity[elements], e_modulus[elements],
+                                                      area[elements], density[elements])
+        with self.timings.phase("element_kernels"):
+            if kind == "stiffness":
+                return Kernels.stiffness_blocks(coordinates, connectivity, e_modulus, area)
+            if kind == "mass":
+                return Kernels.mass_blocks(coordinates, connectivity, density, area)
+        raise ValueError(f"Unknown matrix kind '{kind}'.")
 
-    def enumerate_dof(self):
+    def _topology_state(self):
         """
-        Enumerate global DOFs for all nodes in the structure.
+        Snapshot of everything the sparsity pattern depends on:
+        node and element counts, constraints, connectivity and DOF ordering.
         """
-        print("Enumerating global DOFs...")
-        counter = 0
-        for node in self.nodes:
-            for i in range(3):
-                if node.constraint.fixed[i]:
-                    node.dof_number[i] = -1
-                else:
-                    node.dof_number[i] = counter
-                    counter += 1
-        self.num_dof = counter
-        return counter
+        return (self.node_table.state("constraint_mask") + self.element_table.state("connectivity")
+                + (self.dof_ordering,))
 
-    def assemble_stiffness_matrix(self):
+    def assembly_plan(self):
         """
-        Assemble the global stiffness matrix for the structure.
-        This is a placeholder for the actual assembly logic.
+        Get the symbolic assembly plan (CSR pattern and scatter index), computed once
+        per connectivity, constraint set and DOF ordering and shared by K and M.
         """
-        print("Assembling global stiffness matrix...")
-        # Implement the assembly logic here
-        # This could involve iterating over elements and nodes to build the global stiffness matrix
-        # Step 1: Enumerate DOFs
-        self.enumerate_dof()
-        
+        state = self._topology_state()
+        if self._plan is None or self._plan_state != state:
+            self.ensure_dof_numbering()
+            with self.timings.phase("assembly"):
+                self._plan = AssemblyPlan(self.element_dof_maps(), self.num_dof)
+            self._plan_state = state
+        return self._plan
 
-        # Step 2: Initialize global stiffness matrix
-        n = self.num_dof
-        self.K_global = np.zeros((n, n))
-        if self.num_dof == 0:
-            raise ValueError("DOF enumeration must be run before assembling stiffness matrix.")
-        
-        # Step 3: Loop over elements and assemble
-        for element in self.elements:
-            k_local = element.compute_stiffness_matrix()  # 6x6
-            dof_map = element.node1.dof_number + element.node2.dof_number  # length 6
-
-            for i_local, i_global in enumerate(dof_map):
-                if i_global == -1:
-                    continue  # constrained DOF
-
-                for j_local, j_global in enumerate(dof_map):
-                    if j_global == -1:
-                        continue
-                    self.K_global[i_global, j_global] += k_local[i_local, j_local]
-        print("My stiffness matrix:")
-        df = pd.DataFrame(self.K_global)
-        print(df)
+    def _cached_matrix(self, kind):
+        """
+        Get the global sparse matrix from the per-element block cache.
+        Blocks of elements whose nodes moved or whose properties changed are
+        recomputed and patched into the matrix in place; topology, constraint or
+        ordering changes trigger a full rebuild.
+        """
+        state = self._topology_state()
+        entry = self._matrix_caches.get(kind)
+        if entry is not None and entry["state"] == state:
+            moved = self.node_table.changed_rows(entry["node_revision"])
+            changed = self.element_table.changed_rows(entry["element_revision"])
+            if moved is not None and changed is not None:
+                dirty = np.zeros(len(self.elements), dtype=bool)
+                dirty[changed] = True
+                if moved.size:
+                    node_moved = np.zeros(len(self.nodes), dtype=bool)
+                    node_moved[moved] = True
+                    dirty |= node_moved[self.connectivity].any(axis=1)
+                elements = np.flatnonzero(dirty)
+                if elements.size:
+                    with self.timings.phase("assembly"):
+                        entry["cache"].update(elements, self._element_blocks(kind, elements))
+                entry["node_revision"] = self.node_table.revision
+                entry["element_revision"] = self.element_table.revision
+                return entry["cache"].matrix
+
+        # Full rebuild of the blocks, numeric assembly over the shared plan
+        plan = self.assembly_plan()
+        with self.timings.phase("assembly"):
+            cache = ElementMatrixCache(plan, self._element_blocks(kind))
+        self._matrix_caches[kind] = {
+            "cache": cache, "state": state,
+            "node_revision": self.node_table.revision,
+            "element_revision": self.element_table.revision,
+        }
+        return cache.matrix
+
+    def compute_internal_forces(self, U_global=None):
+        """
+        Compute the axial force of every element at once.
+        `U_global` defaults to the last static solution.
+        """
+        if U_global is None:
+            U_global = self.displacement
+        with self.timings.phase("recovery"):
+            coordinates, connectivity, e_modulus, area, _ = self.element_arrays()
+            return Kernels.axial_forces(coordinates, connectivity, e_modulus, area,
+                                        self.element_dof_maps(), U_global)
+
+    def assemble_stiffness_matrix(self, sparse=True):
+        """
+        Assemble the global stiffness matrix for the structure.
+        Returns a CSR matrix, or a dense array when `sparse` is False.
+        """
+        logger.info("Assembling global stiffness matrix...")
+        # Memoized and patched in place by the operator layer
+        self.K_global = self.operators.K
+        if not sparse:
+            self.K_global = self.K_global.toarray()
+        logger.debug("Global stiffness matrix:\n%s", self.K_global)
         return self.K_global
 
-    def assemble_mass_matrix(self):
+    def assemble_mass_matrix(self, sparse=True):
         """
         Assembly the global mass matrix, which here are quite the same as the stiffness matrix
         assembly.
         """
-        # Step 1: Enumerate dof
-        self.enumerate_dof()
-        # Step 2: Initialize global mass matrix
-        n = self.num_dof
-        self.m_global = np.zeros((n, n))
-        if self.num_dof == 0:
-            raise ValueError("DOF enumeration must be run before assembling stiffness matrix.")
-        
-        # Step 3: Loop over elements and assemble
-        for element in self.elements:
-            m_local = element.compute_mass_matrix()  # 6x6
-            dof_map = element.node1.dof_number + element.node2.dof_number  # length 6
-
-            for i_local, i_global in enumerate(dof_map):
-                if i_global == -1:
-                    continue  # constrained DOF
-
-                for j_local, j_global in enumerate(dof_map):
-                    if j_global == -1:
-                        continue
-                    self.m_global[i_global, j_global] += m_local[i_local, j_local]
-        print("My mass matrix:")
-        df = pd.DataFrame(self.m_global)
-        print(df)
-        
+        logger.info("Assembling global mass matrix...")
+        # Memoized and patched in place by the operator layer
+        self.m_global = self.operators.M
+        if not sparse:
+            self.m_global = self.m_global.toarray()
+        logger.debug("Global mass matrix:\n%s", self.m_global)
         return self.m_global
     
+    def _load_vector(self):
+        """
+        Gather the nodal loads of all free DOFs into a (num_dof, 1) vector.
+        """
+        with self.timings.phase("bc_reduction"):
+            free = self.dof_map != -1
+            f_global = np.zeros((self.num_dof, 1))
+            f_global[self.dof_map[free], 0] = self.nodal_loads[free]
+        return f_global
+
     def assemble_load_vector(self):
         """
         Assemble the global load vector for the structure.
-        This is a placeholder for the actual assembly logic.
         """
-        print("Assembling global load vector...")
-        self.enumerate_dof()
-
-        n = self.num_dof
-        self.f_global = np.zeros((n, 1))
-
-        for node in self.nodes:
-            if node.force is None:
-                continue
-            for i, dof in enumerate(node.dof_number):
-                if dof != -1:
-                    self.f_global[dof] += node.force[i]
-        print("My load vector:")
-        df = pd.DataFrame(self.f_global)
-        print(df)
-        
+        logger.info("Assembling global load vector...")
+        self.f_global = self.operators.f
+        logger.debug("Global load vector:\n%s", self.f_global)
         return self.f_global
         
 
@@ -280,7 +665,7 @@ class Structure:
         Select the displacement for a specific node.
         """
         if 0 <= node_index < len(self.nodes):
-            print(self.nodes[node_index].displacement)
+            logger.debug("Displacement of node %d: %s", node_index, self.nodes[node_index].displacement)
             return self.nodes[node_index].displacement
         else:
             raise IndexError("Node index out of range.")
@@ -0,0 +1,230 @@
+import numpy as np
+
+def read_only(array):
+    """
+    Return a read-only view of `array`, so writes must go through the setters
+    that keep the revision counters up to date.
+    """
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+class _Table():
+    """
+    Base class for a growable struct-of-arrays table. Subclasses list their
+    columns in `_columns` as (name, width, dtype, fill value). Changes to the
+    `_tracked` columns are also stamped per row in `row_revisions`, so caches
+    can update only the rows that changed.
+    """
+    _columns = ()
+    _tracked = ()
+
+    def __init__(self, capacity=16):
+        self.count = 0
+        # Revision counter per column, bumped on every change so caches can detect stale data
+        self.revisions = {}
+        # Table-wide counter and the last change of a tracked column that had no row information
+        self.revision = 0
+        self.full_revision = 0
+        for name, width, dtype, fill in self._columns:
+            setattr(self, "_" + name, np.full((max(capacity, 1),) + width, fill, dtype=dtype))
+            self.revisions[name] = 0
+
+    def __len__(self):
+        return self.count
+
+    def modified(self, *columns, rows=None):
+        """
+        Record that the given columns (all columns by default) have changed.
+        Pass `rows` when only some rows changed, so incremental updates stay possible.
+        """
+        columns = columns or tuple(self.revisions)
+        self.revision += 1
+        for name in columns:
+            self.revisions[name] += 1
+
+        if any(name in self._tracked for name in columns):
+            if rows is None:
+                self.full_revision = self.revision
+            else:
+                self._row_revisions[np.asarray(rows, dtype=np.int64)] = self.revision
+
+    def changed_rows(self, since):
+        """
+        Get the rows whose tracked columns changed after table revision `since`,
+        or None when a whole-column change requires a full rebuild.
+        """
+        if self.full_revision > since:
+            return None
+        return np.flatnonzero(self._row_revisions[:self.count] > since)
+
+    def state(self, *columns):
+        """
+        Get a hashable snapshot of the row count and the revisions of the given columns.
+        """
+        return (self.count,) + tuple(self.revisions[name] for name in columns)
+
+    def _reserve(self, extra):
+        """
+        Make room for `extra` more rows, doubling the capacity when needed,
+        and return the indices of the new rows.
+        """
+        start = self.count
+        needed = start + extra
+        capacity = len(getattr(self, "_" + self._columns[0][0]))
+        if needed > capacity:
+            capacity = max(needed, 2 * capacity)
+            for name, width, dtype, fill in self._columns:
+                old = getattr(self, "_" + name)
+                new = np.full((capacity,) + width, fill, dtype=dtype)
+                new[:start] = old[:start]
+                setattr(self, "_" + name, new)
+        self.count = needed
+        return np.arange(start, needed)
+
+    def take(self, rows):
+        """
+        Keep only `rows`, in the given order, and compact the table.
+        Row indices change, so every column is marked as modified.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        for name, width, dtype, fill in self._columns:
+            old = getattr(self, "_" + name)
+            new = np.full((max(len(old), 1),) + width, fill, dtype=dtype)
+            new[:len(rows)] = old[rows]
+            setattr(self, "_" + name, new)
+        self.count = len(rows)
+        self.modified()
+
+class NodeTable(_Table):
+    """
+    Contiguous per-node arrays: coordinates, constraint mask, nodal loads,
+    DOF map and displacements.
+    """
+    _columns = (
+        ("coordinates", (3,), float, 0.0),
+        ("constraint_mask", (3,), bool, False),
+        ("nodal_loads", (3,), float, 0.0),
+        ("dof_map", (3,), np.int64, -1),
+        ("displacements", (3,), float, 0.0),
+        ("row_revisions", (), np.int64, 0),
+    )
+    _tracked = ("coordinates",)
+
+    @property
+    def coordinates(self):
+        return self._coordinates[:self.count]
+
+    @property
+    def constraint_mask(self):
+        return self._constraint_mask[:self.count]
+
+    @property
+    def nodal_loads(self):
+        return self._nodal_loads[:self.count]
+
+    @property
+    def dof_map(self):
+        return self._dof_map[:self.count]
+
+    @property
+    def displacements(self):
+        return self._displacements[:self.count]
+
+    def append(self, position):
+        """
+        Add one node and return its index.
+        """
+        index = self._reserve(1)[0]
+        self._coordinates[index] = position
+        return index
+
+    def extend(self, coordinates):
+        """
+        Add a block of nodes from an (n, 3) array and return their indices.
+        """
+        indices = self._reserve(len(coordinates))
+        self._coordinates[indices] = coordinates
+        return indices
+
+class ElementTable(_Table):
+    """
+    Contiguous per-element arrays: connectivity (node indices into `node_table`)
+    and the E, A and rho of every element.
+    """
+    _columns = (
+        ("connectivity", (2,), np.int64, -1),
+        ("e_modulus", (), float, 0.0),
+        ("area", (), float, 0.0),
+        ("density", (), float, 0.0),
+        ("row_revisions", (), np.int64, 0),
+    )
+    _tracked = ("e_modulus", "area", "density")
+
+    def __init__(self, node_table, capacity=16):
+        super().__init__(capacity)
+        self.node_table = node_table
+
+    @property
+    def connectivity(self):
+        return self._connectivity[:self.count]
+
+    @property
+    def e_modulus(self):
+        return self._e_modulus[:self.count]
+
+    @property
+    def area(self):
+        return self._area[:self.count]
+
+    @property
+    def density(self):
+        return self._density[:self.count]
+
+    def append(self, connectivity, e_modulus, area, density):
+        """
+        Add one element and return its index.
+        """
+        index = self._reserve(1)[0]
+        self._connectivity[index] = connectivity
+        self._e_modulus[index] = e_modulus
+        self._area[index] = area
+        self._density[index] = density
+        return index
+
+    def extend(self, connectivity, e_modulus, area, density):
+        """
+        Add a block of elements from an (n, 2) connectivity array and return their indices.
+        Material values may be scalars or one value per element.
+        """
+        indices = self._reserve(len(connectivity))
+        self._connectivity[indices] = connectivity
+        self._e_modulus[indices] = e_modulus
+        self._area[indices] = area
+        self._density[indices] = density
+        return indices
+
+class TableViews():
+    """
+    Lazy read-only sequence over a table. Each access builds a thin view object
+    with `factory(table, index)`, so no per-row Python object is kept alive.
+    """
+    def __init__(self, table, factory):
+        self.table = table
+        self.factory = factory
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.factory(self.table, i) for i in range(*index.indices(len(self.table)))]
+        if index < 0:
+            index += len(self.table)
+        if not 0 <= index < len(self.table):
+            raise IndexError("Table index out of range.")
+        return self.factory(self.table, index)
+
+    def __iter__(self):
+        for index in range(len(self.table)):
+            yield self.factory(self.table, index)
@@ -3,6 +3,7 @@ import pyvista as pv
 import numpy as np
 from moviepy import VideoFileClip
 from pathlib import Path
+from Instrumentation import profile_phase
 
 class Visualizer:
     def __init__(self, elements: list):
@@ -186,13 +187,15 @@ class Visualizer:
         )
     
     
+    @profile_phase("animate_displacement")
     def animate_displacement(self, plotter, displacement_history, time_history):
         """
             _summary_
         Animate the structure's deformation over time, coloring elements by axial force.
         Parameters:
         1. plotter: pyvista.Plotter object for rendering
-        2. displacement_history: 2D numpy array of shape (num_dofs, num_time_steps)
+        2. displacement_history: 2D numpy array of shape (num_dofs, num_time_steps), or the
+           memory-mapped history of a streamed run, read one time step at a time
         3. time_history: 1D numpy array of time steps corresponding to displacement_history
         """
         def apply_displacement(pos, disp, scale=10):
@@ -208,10 +211,15 @@ class Visualizer:
         multi_block = []
         forces = []
 
+        # Read every time step once and index into that column: on a streamed,
+        # DOF-major history each element access would be a strided read of the map
+        first_column = np.asarray(displacement_history[:, 0])
+        last_column = np.asarray(displacement_history[:, num_steps - 1])
+
         # Initialize node displacements 
         for node in self.nodes:
             node.displacement = np.array([
-                displacement_history[d, num_steps - 1] if d != -1 else 0.0
+                last_column[d] if d != -1 else 0.0
                 for d in node.dof_number
             ])
 
@@ -231,7 +239,7 @@ class Visualizer:
             pos1_def = pos1 + self.scale_displacement * disp1_full
 
             # compute element force at first time (or whichever baseline you want)
-            f_local = element.compute_internal_force(displacement_history[:, 0])
+            f_local = element.compute_internal_force(first_column)
             forces.append(f_local)
 
             multi_block.append(pv.Line(pos0_def, pos1_def))
@@ -245,7 +253,8 @@ class Visualizer:
         # STEP 1: Compute global color limits (symmetric around zero)
         all_forces = []
         for step in range(num_steps):
-            step_forces = [element.compute_internal_force(displacement_history[:, step])
+            column = np.asarray(displacement_history[:, step])
+            step_forces = [element.compute_internal_force(column)
                         for element in self.element]
             all_forces.extend(step_forces)
         all_forces = np.asarray(all_forces)
@@ -254,7 +263,7 @@ class Visualizer:
         clim = (-clim_factor * absmax, clim_factor * absmax)
 
         # STEP 2: Initial plot with first time step
-        init_forces = np.array([element.compute_internal_force(displacement_history[:, 0])
+        init_forces = np.array([element.compute_internal_force(first_column)
                                 for element in self.element])
         # After combine(), assign cell_data (not point_data)
         combined = multi_block_mesh.combine()
@@ -279,11 +288,12 @@ class Visualizer:
         # STEP 3: Animation loop (use cell_data) 
         for step in range(1, num_steps):
             forces = []
+            column = np.asarray(displacement_history[:, step])
 
             # Update node displacements
             for node in self.nodes:
                 node.displacement = np.array([
-                    displacement_history[d, step] if d != -1 else 0.0
+                    column[d] if d != -1 else 0.0
                     for d in node.dof_number
                 ])
 
@@ -296,7 +306,7 @@ class Visualizer:
                                             np.array(nodes[1].displacement), self.scale_displacement)
                 multi_block[i].points[:] = [pos0_def, pos1_def]
 
-                f_local = element.compute_internal_force(displacement_history[:, step])
+                f_local = element.compute_internal_force(column)
                 forces.append(f_local)
 
             # Combine MultiBlock and assign cell scalars (one per element/cell)
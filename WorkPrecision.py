@@ -0,0 +1,153 @@
+import argparse
+import itertools
+import json
+import time
+import numpy as np
+import scipy.linalg as la
+import matplotlib.pyplot as plt
+import Generators
+from Structure import Structure
+from Dynamic import dynamic
+
+def single_bar(e_modulus=Generators.E_MODULUS, area=Generators.AREA, density=Generators.DENSITY,
+               length=1.0, load=1e3):
+    """
+    Single-DOF oscillator: one bar fixed at one end, the other end free along the
+    bar axis only and loaded axially. k = EA/L and the consistent mass is rho*A*L/3.
+    """
+    structure = Structure()
+    structure.add_nodes([[0.0, 0.0, 0.0], [length, 0.0, 0.0]])
+    structure.add_elements([[0, 1]], e_modulus, area, density)
+    structure.set_constraints([0], [True, True, True])
+    structure.set_constraints([1], [False, True, True])
+    structure.set_forces([1], [load, 0.0, 0.0])
+    return structure
+
+PROBLEMS = {
+    "sdof": single_bar,
+    "tetrahedron": Generators.tetrahedron,
+}
+
+def modal_step_response(K, M, R, alpha_1, alpha_2, times):
+    """
+    Exact response from rest to the constant load R with Rayleigh damping
+    C = alpha_1 * M + alpha_2 * K, by superposing the decoupled modal responses.
+    Returns (num_dof, n_times) displacements and the natural frequencies.
+    """
+    omega_squared, modes = la.eigh(K, M)
+    omega = np.sqrt(omega_squared)
+    zeta = (alpha_1 / omega + alpha_2 * omega) / 2
+    static = (modes.T @ np.ravel(R)) / omega_squared
+
+    # Roots of s^2 + 2 zeta omega s + omega^2 (complex when underdamped)
+    root = omega * np.sqrt(zeta.astype(complex) ** 2 - 1)
+    s1, s2 = -zeta * omega + root, -zeta * omega - root
+    t = np.asarray(times, dtype=float)[None, :]
+    critical = np.isclose(zeta, 1.0)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        transient = (s2[:, None] * np.exp(s1[:, None] * t) - s1[:, None] * np.exp(s2[:, None] * t)) / (s1 - s2)[:, None]
+    transient = np.where(critical, -(1 + omega[:, None] * t) * np.exp(-omega[:, None] * t), transient.real)
+    return modes @ (static[:, None] * (1 + transient)), omega
+
+def run_case(problem, dt, final_time, rho=0.9, alpha_1=0.01, alpha_2=0.02, ne=None):
+    """
+    Integrate one reference problem and measure the cost and the error against
+    the exact modal solution. `ne=None` turns the step size adaptation off.
+    """
+    structure = PROBLEMS[problem]()
+    solver = dynamic(structure)
+    # v1 == v2 leaves an empty adaptation band, the step size stays fixed
+    v1, v2, ne_value = (1.0, 1.0, 1e-2) if ne is None else (0.5, 1.0, ne)
+
+    start = time.process_time()
+    solver.generalized_alpha(dt, 0.0, final_time, alpha_1, alpha_2, rho, v1, v2, ne_value)
+    cpu_seconds = time.process_time() - start
+
+    # The exact solution is sampled at the recorded step times, which must be
+    # the times the integrator actually reached, also when the step size adapts
+    if not np.allclose(np.diff(solver.time), solver.dt_hist[1:]):
+        raise ValueError("The recorded step times do not match the integrated step sizes.")
+    exact, omega = modal_step_response(solver.K.toarray(), solver.M.toarray(), solver.R, alpha_1, alpha_2, solver.time)
+    error = np.linalg.norm(solver.u - exact, axis=0).max() / np.linalg.norm(exact, axis=0).max()
+    return {
+        "problem": problem, "dt": dt, "rho": rho, "ne": ne, "alpha_1": alpha_1, "alpha_2": alpha_2,
+        "steps": len(solver.time) - 1, "cpu_seconds": cpu_seconds, "error": float(error),
+        "omega_max": float(omega.max()),
+    }
+
+def sweep(problem, periods=2.0, steps_per_period=(5, 10, 20, 50, 100, 200), rhos=(0.5, 0.8, 0.9, 1.0),
+          nes=(None, 1e-2), alpha_1=0.01, alpha_2=0.02):
+    """
+    Work-precision sweep of one problem over step sizes (as steps per period of the
+    highest mode), spectral radii and adaptation thresholds. The time span covers
+    `periods` periods of the fundamental mode.
+    """
+    structure = PROBLEMS[problem]()
+    operators = structure.operators
+    omega = np.sqrt(la.eigh(operators.K.toarray(), operators.M.toarray(), eigvals_only=True))
+    final_time = periods * 2 * np.pi / omega.min()
+    shortest_period = 2 * np.pi / omega.max()
+
+    records = []
+    for n, rho, ne in itertools.product(steps_per_period, rhos, nes):
+        records.append(run_case(problem, shortest_period / n, final_time, rho, alpha_1, alpha_2, ne))
+    return records
+
+def cheapest(records, tolerance):
+    """
+    Get the record with the lowest CPU time whose error is within `tolerance`,
+    None when no setting is accurate enough.
+    """
+    accurate = [record for record in records if record["error"] <= tolerance]
+    return min(accurate, key=lambda record: record["cpu_seconds"]) if accurate else None
+
+def plot(records, ax=None):
+    """
+    Work-precision diagram: error against CPU time, one line per (rho, ne) setting.
+    """
+    if ax is None:
+        plt.figure(figsize=(8, 6))
+        ax = plt.gca()
+    key = lambda record: (record["rho"], str(record["ne"]))
+    for (rho, ne), group in itertools.groupby(sorted(records, key=key), key=key):
+        group = sorted(group, key=lambda record: record["cpu_seconds"])
+        ax.loglog([record["cpu_seconds"] for record in group], [record["error"] for record in group],
+                  marker="o", label=f"rho={rho}, ne={ne}")
+    ax.set_xlabel("CPU time [s]")
+    ax.set_ylabel("Relative max displacement error")
+    ax.set_title("Generalized-alpha work-precision")
+    ax.grid(True, which="both")
+    ax.legend()
+    return ax
+
+def main():
+    parser = argparse.ArgumentParser(description="Work-precision benchmark of the generalized-alpha integrator.")
+    parser.add_argument("--problems", nargs="+", default=list(PROBLEMS), choices=list(PROBLEMS))
+    parser.add_argument("--tolerance", type=float, default=1e-2)
+    parser.add_argument("--output", help="save the records as JSON")
+    parser.add_argument("--plot", action="store_true")
+    args = parser.parse_args()
+
+    records = []
+    for problem in args.problems:
+        results = sweep(problem)
+        for record in results:
+            print(f"{problem:12s} dt {record['dt']:.3e} rho {record['rho']:.2f} ne {str(record['ne']):6s} "
+                  f"steps {record['steps']:7d} cpu {record['cpu_seconds']:.4f} s error {record['error']:.3e}")
+        best = cheapest(results, args.tolerance)
+        if best is None:
+            print(f"{problem}: no setting reaches error {args.tolerance:g}")
+        else:
+            print(f"{problem}: cheapest setting within {args.tolerance:g} is dt {best['dt']:.3e}, "
+                  f"rho {best['rho']}, ne {best['ne']} ({best['steps']} steps, {best['cpu_seconds']:.4f} s)")
+        records += results
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(records, file, indent=2, sort_keys=True)
+    if args.plot:
+        plot(records)
+        plt.show()
+
+if __name__ == "__main__":
+    main()